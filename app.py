@@ -17,5 +17,44 @@ def main_menu():
 
     root.mainloop()
 
+def launch(start="menu", check_progress=True):
+    if check_progress:
+        from progress_gc import report_in_background
+        report_in_background()           # only counts orphans; gc-progress moves them
+    if start == "nouns":
+        start_noun_trainer(tk.Tk())
+    elif start == "v006":
+        from app_v006 import VocabTrainer
+        root = tk.Tk()
+        VocabTrainer(root)
+        root.mainloop()
+    else:
+        main_menu()
+
 if __name__ == "__main__":
-    main_menu()
+    import argparse
+    ap = argparse.ArgumentParser(description="Italienisch Trainer")
+    ap.add_argument("--start", choices=("menu", "nouns", "v006"), default="menu",
+                    help="screen to open first (default: main menu)")
+    ap.add_argument("--profile", metavar="DIR",
+                    help="run the session under cProfile/tracemalloc and write the results to DIR")
+    ap.add_argument("--replay", metavar="SCRIPT",
+                    help="drive the session from a JSON list of key/click steps")
+    ap.add_argument("--scratch", metavar="DIR",
+                    help="data directory for --replay/--profile runs (default: a new temporary one)")
+    args = ap.parse_args()
+
+    if args.replay:
+        from profiling import Replay
+        Replay.from_file(args.replay).install()
+    if args.replay or args.profile:
+        # same starting state every run: empty progress, pinned clock and seed
+        import os
+        from profiling import scratch_session
+        out = args.profile and os.path.abspath(args.profile)
+        scratch_session(args.scratch and os.path.abspath(args.scratch))
+    if args.profile:
+        from profiling import run_profiled
+        run_profiled(lambda: launch(args.start, check_progress=False), out)
+    else:
+        launch(args.start, check_progress=not args.replay)
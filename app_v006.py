@@ -1,53 +1,111 @@
 import tkinter as tk
-import random
 from tkinter import messagebox, filedialog
 import os
-import json
+import math
 import time
+from sampler import DueSampler
+from session import SessionPlanner, DailyCount
+from history import NavHistory
+from instrument import timed, count, overlay
+from corpus import load_corpus, lecture_paths, check_file
+from matching import grade, ALMOST, WRONG
+from indexes import ReverseIndex, AnswerIndex, de_list
+from clock import session_clock, session_rng
+from bulk_io import read_rows
+from audio import Pronouncer
+from jsonio import load_json, dump_json, resolve, is_json, json_stem
+from leeches import lapse, is_suspended, release, leech_window
+from learning import learn, relearn
+from load_balance import DueHistogram
+from collections import ChainMap
 
 # --- Load lectures from JSON files ---
+@timed("lecture.load")
 def load_lectures():
     data = {}
-    for filename in os.listdir("lectures"):
-        if filename.endswith(".json"):
-            with open(os.path.join("lectures", filename), "r", encoding="utf-8") as f:
-                content = json.load(f)
-                lecture_name = os.path.splitext(filename)[0]
-                data[lecture_name] = content
+    corpus = load_corpus()
+    if corpus:
+        for name in corpus.names():
+            data[json_stem(os.path.basename(name))] = corpus.lecture(name)
+        return data
+    # no (fresh) compiled corpus: validate the files under lectures/ directly
+    for path in lecture_paths("lectures"):
+        name, entries, _, _ = check_file(path)
+        lecture_name = json_stem(os.path.basename(name))
+        data[lecture_name] = {k: {"de": de, "conjugation": conj or {}} for k, de, conj in entries}
     return data
 
 
 class SRS:
-    def __init__(self):
-        self.progress_file = "srs_progress.json"
+    def __init__(self, filename="srs_progress.json", clock=time.time):
+        self.progress_file = filename and resolve(filename)   # may be .gz/.xz/.zst
+        self.clock = clock
         self.progress = self.load_progress()
+        self.load = DueHistogram(self.progress.values())    # reviews per day
 
+    @timed("srs.save_progress")
     def save_progress(self):
-        with open(self.progress_file, "w", encoding="utf-8") as f:
-            json.dump(self.progress, f)
+        if not self.progress_file:
+            return
+        dump_json(self.progress, self.progress_file)
 
     def load_progress(self):
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+        if self.progress_file and os.path.exists(self.progress_file):
+            return load_json(self.progress_file)
         return {}
 
+    def record(self, word):
+        return self.progress.get(word)
+
+    def due(self, word):
+        record = self.progress.get(word)
+        if record is None:
+            return 0
+        return math.inf if is_suspended(record) else record["due"]
+
     def get_interval(self, word):
         record = self.progress.get(word, {"interval": 1, "due": 0, "ease": 2.5})
-        if time.time() >= record["due"]:
+        if self.clock() >= record["due"] and not is_suspended(record):
             return record
         return None
 
-    def update(self, word, correct):
-        now = time.time()
+    def suspended(self, word):
+        return is_suspended(self.progress.get(word))
+
+    def leeches(self):
+        return [k for k, rec in self.progress.items() if rec.get("leech")]
+
+    def release(self, word, reset=False):
+        self.load.remove(self.progress[word])    # counted if only tagged
+        release(self.progress[word], reset)
+        self.load.add(self.progress[word])
+        self.save_progress()
+
+    @timed("srs.update")
+    def update(self, word, correct, almost=False):
+        now = self.clock()
+        seen = word in self.progress
         record = self.progress.get(word, {"interval": 1, "due": now, "ease": 2.5})
-        if correct:
+        if seen:                            # a new card is in no day bucket yet
+            self.load.remove(record)
+        learning = False
+        if not seen or "step" in record:   # new / relearning: minute steps first
+            learning = learn(record, correct, now)
+        elif correct and almost:
+            record["interval"] = max(record["interval"] + 1, int(record["interval"] * 1.2))
+            record["ease"] = max(1.3, record["ease"] - 0.15)
+        elif correct:
             record["interval"] = max(1, int(record["interval"] * record["ease"]))
             record["ease"] = min(3.0, record["ease"] + 0.1)
         else:
             record["interval"] = 1
             record["ease"] = max(1.3, record["ease"] - 0.2)
-        record["due"] = now + record["interval"] * 24 * 60 * 60
+            lapse(record)                   # may suspend it as a leech
+            learning = relearn(record, now)
+        if not learning:                    # spread over the least loaded nearby day
+            record["interval"] = self.load.pick(now, record["interval"])
+            record["due"] = now + record["interval"] * 24 * 60 * 60
+        self.load.add(record)
         self.progress[word] = record
 
 
@@ -57,15 +115,21 @@ class VocabTrainer:
         self.root.title("Italian-German Vocabulary Trainer")
 
         self.reverse = False
-        self.word_history = []
-        self.history_index = -1
+        self.history = NavHistory()
 
         self.lectures = load_lectures()
+        self.answers = AnswerIndex(ChainMap(*self.lectures.values()))   # all lectures
         self.current_lecture = tk.StringVar()
         self.current_lecture.set(list(self.lectures.keys())[0])
         self.vocab = self.lectures[self.current_lecture.get()]
 
-        self.srs = SRS()
+        self.clock, self.rng = session_clock(), session_rng()
+        self.speaker = Pronouncer()
+        self.srs = SRS(clock=self.clock)
+        self.new_today = DailyCount(self.clock)     # kept when the planner is rebuilt
+        self.sampler = self.make_sampler()
+        self.planner = self.make_planner()
+        self.rev_idx = ReverseIndex(self.vocab)
 
         lecture_menu = tk.OptionMenu(root, self.current_lecture, *self.lectures.keys(), command=self.select_lecture)
         lecture_menu.pack(pady=5)
@@ -82,6 +146,10 @@ class VocabTrainer:
         self.feedback_label = tk.Label(root, text="", font=("Helvetica", 14))
         self.feedback_label.pack(pady=10)
 
+        self.listen_button = tk.Button(root, text="🔊 Ascolta", command=lambda: self.speaker.play(self.current_word),
+                                       state="normal" if self.speaker.available else "disabled")
+        self.listen_button.pack(pady=10)
+
         self.next_button = tk.Button(root, text="Next", command=self.next_word)
         self.next_button.pack(pady=10)
 
@@ -94,62 +162,110 @@ class VocabTrainer:
         self.stats_button = tk.Button(root, text="Show Stats", command=self.show_stats)
         self.stats_button.pack(pady=10)
 
+        self.leech_button = tk.Button(root, text="Leeches",
+                                      command=lambda: leech_window(self.root, self.srs, self.leeches_changed))
+        self.leech_button.pack(pady=10)
+
+        overlay(root)
+
         self.current_word = None
-        self.next_word()
+        self.new_word()
+
+    def make_planner(self):
+        return SessionPlanner(self.vocab.keys(), self.srs.record, clock=self.clock,
+                              skip=self.srs.suspended, new_today=self.new_today)
+
+    def make_sampler(self):                 # never-seen cards only via the planner's limit
+        return DueSampler(self.vocab.keys(), self.srs.due, clock=self.clock, rng=self.rng, new_weight=0)
 
     def select_lecture(self, _):
         self.vocab = self.lectures[self.current_lecture.get()]
-        self.word_history.clear()
-        self.history_index = -1
-        self.next_word()
+        self.sampler = self.make_sampler()
+        self.planner = self.make_planner()
+        self.rev_idx = ReverseIndex(self.vocab)
+        self.history.clear()
+        self.new_word()
 
     def toggle_direction(self):
         self.reverse = not self.reverse
         self.direction_button.config(text=f"Switch to {'Italian → German' if self.reverse else 'German → Italian'}")
-        self.next_word()
+        self.new_word()
 
-    def next_word(self, event=None):
+    def show_word(self, word):
+        self.current_word = word
+        self.entry.config(state="normal")
         self.entry.delete(0, tk.END)
         self.feedback_label.config(text="")
 
-        words = list(self.vocab.keys())
-        due_words = [w for w in words if self.srs.get_interval(w)]
-        if not due_words:
-            due_words = words
+        display_word = de_list(self.vocab[self.current_word])[0] if self.reverse else self.current_word
+        self.word_label.config(text=display_word)
+        self.allow_listen(not self.reverse)  # German prompt: the audio would be the answer
 
-        self.current_word = random.choice(due_words)
-        self.word_history.append(self.current_word)
-        self.history_index = len(self.word_history) - 1
+    def allow_listen(self, ok=True):
+        self.listen_button.config(state="normal" if ok and self.speaker.available else "disabled")
 
-        display_word = self.vocab[self.current_word]["de"] if self.reverse else self.current_word
-        self.word_label.config(text=display_word)
+    @timed("v006.next_word")
+    def next_word(self, event=None):
+        card_id = self.history.forward()
+        if card_id is not None:
+            self.show_word(self.sampler.keys[card_id])
+        else:
+            self.new_word()
+
+    def new_word(self):
+        word = self.planner.pop(exclude=self.current_word)
+        count("planner.hit" if word else "planner.miss")
+        word = word or self.sampler.sample()
+        if word is None:                    # nothing due or new: no random filler
+            self.current_word = None        # nothing left to check
+            self.entry.delete(0, tk.END)
+            self.entry.config(state="disabled")
+            self.word_label.config(text="")
+            self.allow_listen(False)
+            self.feedback_label.config(text="🎉 Nothing due right now", fg="green")
+            return
+        self.history.push(self.sampler.index[word])
+        self.show_word(word)
+        self.speaker.prefetch([word, *self.planner.peek(3)])
 
     def previous_word(self, event=None):
-        if self.history_index > 0:
-            self.history_index -= 1
-            self.current_word = self.word_history[self.history_index]
-            display_word = self.vocab[self.current_word]["de"] if self.reverse else self.current_word
-            self.word_label.config(text=display_word)
-            self.entry.delete(0, tk.END)
-            self.feedback_label.config(text="")
+        card_id = self.history.back()
+        if card_id is not None:
+            self.show_word(self.sampler.keys[card_id])
 
-    def get_correct_answer(self):
+    def get_correct_answers(self):
         if not self.reverse:
-            return self.vocab[self.current_word]["de"].lower()
+            de = self.vocab[self.current_word]["de"]
+            return [d.lower() for d in de] if isinstance(de, list) else [de.lower()]
         else:
-            return self.current_word.lower()
+            prompt = de_list(self.vocab[self.current_word])[0]
+            return [w.lower() for w in self.rev_idx.italian_for(prompt)] or [self.current_word.lower()]
 
+    @timed("v006.check")
     def check_answer(self, event=None):
+        if self.current_word is None:
+            return
         answer = self.entry.get().strip().lower()
-        correct = self.get_correct_answer()
-
-        if answer == correct:
+        accepted = self.get_correct_answers()
+        correct = ", ".join(accepted)
+        was_new = self.srs.record(self.current_word) is None
+        mine = {self.current_word, *accepted}
+        result, closest = grade(answer, accepted,       # another word's answer is no typo
+                                taken=lambda a: bool(self.answers.other_cards(a, self.reverse, mine)))
+
+        if result == ALMOST:
+            self.feedback_label.config(text=f"🟡 Quasi! Corretto: {closest}", fg="orange")
+            self.srs.update(self.current_word, True, almost=True)
+        elif result != WRONG:
             self.feedback_label.config(text="✅ Corretto!", fg="green")
             self.srs.update(self.current_word, True)
         else:
             self.feedback_label.config(text=f"❌ Sbagliato. Corretto: {correct}", fg="red")
             self.srs.update(self.current_word, False)
         self.srs.save_progress()
+        self.allow_listen()
+        self.sampler.set_due(self.current_word, self.srs.due(self.current_word))
+        self.planner.answered(self.current_word, was_new)
 
         # Optional: show conjugation
         conj = self.vocab[self.current_word].get("conjugation")
@@ -157,6 +273,10 @@ class VocabTrainer:
             conj_text = "\n".join(f"{k}: {v}" for k, v in conj.items())
             messagebox.showinfo("Coniugazione", conj_text)
 
+    def leeches_changed(self):
+        self.sampler = self.make_sampler()
+        self.planner = self.make_planner()
+
     def show_stats(self):
         stats = self.srs.progress
         if not stats:
@@ -165,20 +285,27 @@ class VocabTrainer:
 
         lines = []
         for word, data in sorted(stats.items(), key=lambda x: x[1]['interval'], reverse=True):
-            due_in = int((data['due'] - time.time()) / 86400)
+            due_in = int((data['due'] - self.clock()) / 86400)
             lines.append(f"{word}: interval={data['interval']} days, ease={round(data['ease'], 2)}, due in {due_in}d")
 
         messagebox.showinfo("Progress Stats", "\n".join(lines[:30]))
 
     def load_new_words(self):
-        filepath = filedialog.askopenfilename(title="Select a JSON file", filetypes=[("JSON files", "*.json")])
+        filepath = filedialog.askopenfilename(
+            title="Select a word list",
+            filetypes=[("JSON files", "*.json *.json.gz *.json.xz *.json.zst"), ("CSV / TSV", "*.csv *.tsv"),
+                       ("Anki text", "*.txt"), ("Anki / SQLite", "*.apkg *.anki2 *.sqlite")])
         if not filepath:
             return
         try:
-            new_lecture_name = os.path.splitext(os.path.basename(filepath))[0]
-            with open(filepath, "r", encoding="utf-8") as f:
-                new_vocab = json.load(f)
+            new_lecture_name = json_stem(os.path.basename(filepath))
+            if is_json(filepath):
+                new_vocab = load_json(filepath)
+            else:
+                new_vocab = {it: {"de": de[0] if len(de) == 1 else de, "conjugation": conj}
+                             for it, de, conj, _ in read_rows(filepath)}
             self.lectures[new_lecture_name] = new_vocab
+            self.answers = AnswerIndex(ChainMap(*self.lectures.values()))
             menu = self.root.nametowidget(self.current_lecture._name)
             menu['menu'].add_command(label=new_lecture_name,
                                      command=tk._setit(self.current_lecture, new_lecture_name, self.select_lecture))
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+CACHE_DIR = os.environ.get("TRAINER_AUDIO_CACHE", "audio_cache")
+CACHE_MAX_BYTES = int(os.environ.get("TRAINER_AUDIO_CACHE_MB", "64")) * 1024 * 1024
+VOICE = "it"
+ENGINES = ("espeak-ng", "espeak")
+PLAYERS = (("aplay", "-q"), ("paplay",), ("afplay",), ("ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"))
+
+
+def speakable(word: str) -> str:
+    """'il tempo (clima)' → 'il tempo'; folds ’ to '."""
+    return " ".join(re.sub(r"\([^)]*\)", " ", word.replace("’", "'")).split()).lower()
+
+
+# ── size-bounded LRU cache on disk ───────────────────────
+class AudioCache:
+    """WAV files keyed by a hash of the normalised word.
+
+    The directory is scanned once; after that an in-memory LRU order and
+    byte total decide what to evict, so lookups never list the directory.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.dir = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()               # filename → size, oldest first
+        self._bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".wav"):
+                st = os.stat(os.path.join(directory, name))
+                entries.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._lru[name] = size
+            self._bytes += size
+
+    @staticmethod
+    def key(word, voice=VOICE):
+        return hashlib.sha1(f"{voice}\0{speakable(word)}".encode("utf-8")).hexdigest()[:20] + ".wav"
+
+    def path(self, word):
+        return os.path.join(self.dir, self.key(word))
+
+    def get(self, word):
+        """Path of the cached audio (marked most recently used) or None."""
+        name = self.key(word)
+        with self._lock:
+            if name not in self._lru:
+                return None
+            self._lru.move_to_end(name)
+        path = os.path.join(self.dir, name)
+        try:
+            os.utime(path)                      # keeps LRU order across restarts
+        except OSError:
+            with self._lock:
+                self._bytes -= self._lru.pop(name, 0)
+            return None
+        return path
+
+    def add(self, word):
+        name = self.key(word)
+        size = os.path.getsize(os.path.join(self.dir, name))
+        with self._lock:
+            self._bytes += size - self._lru.pop(name, 0)
+            self._lru[name] = size
+            while self._bytes > self.max_bytes and len(self._lru) > 1:
+                old, old_size = self._lru.popitem(last=False)
+                self._bytes -= old_size
+                try:
+                    os.remove(os.path.join(self.dir, old))
+                except OSError:
+                    pass
+
+
+# ── offline TTS with a worker pool ───────────────────────
+class Pronouncer:
+    """Generates pronunciations with espeak-ng off the UI thread.
+
+    `available` is False when no engine is installed; every method is then a
+    no-op, so the trainers can call it unconditionally.
+    """
+
+    def __init__(self, cache=None, workers=2, voice=VOICE):
+        self.engine = next((shutil.which(e) for e in ENGINES if shutil.which(e)), None)
+        self.player = next(([shutil.which(p[0]), *p[1:]] for p in PLAYERS if shutil.which(p[0])), None)
+        self.available = self.engine is not None
+        self.voice = voice
+        self.cache = cache or (AudioCache() if self.available else None)
+        self._pool = ThreadPoolExecutor(max_workers=workers) if self.available else None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _generate(self, word):
+        path = self.cache.path(word)
+        tmp = path + ".part"
+        subprocess.run([self.engine, "-v", self.voice, "-w", tmp, speakable(word)],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.replace(tmp, path)
+        self.cache.add(word)
+        return path
+
+    def _ensure(self, word):
+        """Future resolving to the audio path; starts generation if needed."""
+        with self._lock:
+            fut = self._pending.get(word)
+            new = fut is None
+            if new:
+                fut = self._pool.submit(self._generate, word)
+                self._pending[word] = fut
+        if new:      # outside the lock: a finished future runs the callback right here
+            fut.add_done_callback(lambda _f, w=word: self._forget(w))
+        return fut
+
+    def _forget(self, word):
+        with self._lock:
+            self._pending.pop(word, None)
+
+    def prefetch(self, words):
+        if not self.available:
+            return
+        for w in words:
+            if w and self.cache.get(w) is None:
+                self._ensure(w)
+
+    def _play_file(self, path):
+        if self.player:
+            subprocess.Popen([*self.player, path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def play(self, word):
+        """Play without blocking: cached audio starts at once, otherwise when generated."""
+        if not self.available or not word:
+            return
+        path = self.cache.get(word)
+        if path:
+            self._play_file(path)
+            return
+        fut = self._ensure(word)
+        fut.add_done_callback(lambda f: f.exception() is None and self._play_file(f.result()))
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
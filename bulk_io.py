@@ -0,0 +1,283 @@
+import csv
+import html
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zipfile
+
+from jsonio import load_json
+
+DAY = 86_400
+PERSONS = ("io", "tu", "lui/lei", "noi", "voi", "loro")
+FIELDS = ("it", "de") + PERSONS + ("interval", "ease", "due")
+DE_SEP = " | "
+
+# A row is (it, [de, …], {person: form}, srs record or None) – the lecture
+# schema {"de": …, "conjugation": …} plus the SRS fields {"interval", "ease",
+# "due"}. Readers and writers below stream rows one at a time, so memory does
+# not grow with the size of the file.
+
+
+def _split_de(txt):
+    return [d.strip() for d in re.split(r"\s*[|;]\s*", txt or "") if d.strip()]
+
+
+def _srs(interval, ease, due):
+    if interval in (None, "") and due in (None, ""):
+        return None
+    return {
+        "interval": int(float(interval or 1)),
+        "ease": float(ease or 2.5),
+        "due": float(due or 0),
+    }
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".tsv": "tsv", ".txt": "anki", ".apkg": "sqlite",
+            ".anki2": "sqlite", ".sqlite": "sqlite", ".db": "sqlite"}.get(ext, "csv")
+
+
+# ── readers ──────────────────────────────────────────────
+def read_delimited(path, delimiter=","):
+    """CSV/TSV with a header naming FIELDS, or positional it, de[, interval, ease, due]."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        cols = [h.strip().lower() for h in header]
+        if "it" not in cols:                       # no header → positional
+            cols = ["it", "de", "interval", "ease", "due"]
+            reader = _chain([header], reader)
+        for raw in reader:
+            row = dict(zip(cols, raw))
+            it, de = (row.get("it") or "").strip(), _split_de(row.get("de"))
+            if not it or not de:                   # no translation: nothing to ask
+                continue
+            conj = {p: row[p].strip() for p in PERSONS if row.get(p, "").strip()}
+            yield it, de, conj, _srs(row.get("interval"), row.get("ease"), row.get("due"))
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _plain(txt):
+    return html.unescape(_TAG.sub(" ", txt.replace("<br>", " | "))).strip()
+
+
+def read_anki_text(path):
+    """Anki "Notes in plain text": front<TAB>back, '#key:value' header lines."""
+    sep = "\t"
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("#"):
+                key, _, value = line[1:].partition(":")
+                if key == "separator":
+                    sep = {"tab": "\t", "comma": ",", "semicolon": ";", "space": " ",
+                           "pipe": "|"}.get(value.strip().lower(), value)
+                continue
+            parts = line.split(sep)
+            if len(parts) < 2 or not parts[0].strip():
+                continue
+            de = _split_de(_plain(parts[1]))
+            if de:
+                yield _plain(parts[0]), de, {}, None
+
+
+def _conjugation(field):
+    """Our export keeps the conjugation as JSON in field 3; Anki's Extra etc. are ignored."""
+    if not field.startswith("{"):
+        return {}
+    try:
+        conj = json.loads(field)
+    except ValueError:
+        return {}
+    if isinstance(conj, dict) and all(isinstance(v, str) for v in conj.values()):
+        return conj
+    return {}
+
+
+def read_sqlite(path):
+    """notes/cards tables as in an Anki collection (also inside a .apkg zip)."""
+    tmp = None
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as z:
+            name = next(n for n in ("collection.anki21", "collection.anki2") if n in z.namelist())
+            fd, tmp = tempfile.mkstemp(suffix=".anki2")
+            with os.fdopen(fd, "wb") as out, z.open(name) as src:
+                while chunk := src.read(1 << 20):
+                    out.write(chunk)
+            path = tmp
+    con = sqlite3.connect(path)
+    try:
+        try:
+            crt = con.execute("SELECT crt FROM col").fetchone()[0]
+        except sqlite3.Error:
+            crt = 0                         # our own export: due is a day number
+        cur = con.execute(
+            "SELECT n.flds, c.type, c.ivl, c.factor, c.due "
+            "FROM notes n LEFT JOIN cards c ON c.nid = n.id AND c.ord = 0")
+        for flds, ctype, ivl, factor, due in cur:
+            fields = flds.split("\x1f")
+            de = _split_de(_plain(fields[1])) if len(fields) > 1 else []
+            if not de:
+                continue
+            srs = None
+            if ctype == 2:                  # review card
+                srs = {"interval": max(1, ivl), "ease": (factor or 2500) / 1000,
+                       "due": crt + due * DAY}
+            yield _plain(fields[0]), de, _conjugation(fields[2] if len(fields) > 2 else ""), srs
+    finally:
+        con.close()
+        if tmp:
+            os.unlink(tmp)
+
+
+def read_rows(path, fmt=None):
+    fmt = fmt or detect_format(path)
+    if fmt == "tsv":
+        return read_delimited(path, "\t")
+    if fmt == "anki":
+        return read_anki_text(path)
+    if fmt == "sqlite":
+        return read_sqlite(path)
+    return read_delimited(path, ",")
+
+
+def iter_lecture(lecture_paths, progress=None):
+    """Rows from lecture JSON files, with SRS records from `progress` if given."""
+    for p in lecture_paths:
+        for it, entry in load_json(p).items():      # plain or .gz/.xz/.zst
+            if not isinstance(entry, dict) or "de" not in entry:
+                continue
+            de = entry["de"] if isinstance(entry["de"], list) else [entry["de"]]
+            rec = None
+            if progress is not None:
+                rec = progress.get(it.lower().replace("’", "'").strip())
+            yield it, de, entry.get("conjugation") or {}, rec
+
+
+# ── writers ──────────────────────────────────────────────
+def write_delimited(rows, path, delimiter=","):
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=delimiter)
+        w.writerow(FIELDS)
+        for it, de, conj, rec in rows:
+            rec = rec or {}
+            w.writerow([it, DE_SEP.join(de)] + [conj.get(p, "") for p in PERSONS]
+                       + [rec.get("interval", ""), rec.get("ease", ""), rec.get("due", "")])
+            n += 1
+    return n
+
+
+def write_anki_text(rows, path):
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("#separator:tab\n#html:true\n#columns:Front\tBack\n")
+        for it, de, conj, rec in rows:
+            back = "<br>".join(html.escape(d) for d in de)
+            f.write(f"{html.escape(it)}\t{back}\n")
+            n += 1
+    return n
+
+
+_SCHEMA = """
+CREATE TABLE notes (id INTEGER PRIMARY KEY, guid TEXT, mid INTEGER, mod INTEGER,
+                    usn INTEGER, tags TEXT, flds TEXT, sfld TEXT, csum INTEGER,
+                    flags INTEGER, data TEXT);
+CREATE TABLE cards (id INTEGER PRIMARY KEY, nid INTEGER, did INTEGER, ord INTEGER,
+                    mod INTEGER, usn INTEGER, type INTEGER, queue INTEGER, due INTEGER,
+                    ivl INTEGER, factor INTEGER, reps INTEGER, lapses INTEGER,
+                    left INTEGER, odue INTEGER, odid INTEGER, flags INTEGER, data TEXT);
+"""
+
+
+def write_sqlite(rows, path, batch=1000):
+    """Anki-style notes/cards tables; `due` is days since the epoch."""
+    if os.path.exists(path):
+        os.unlink(path)
+    con = sqlite3.connect(path)
+    con.executescript(_SCHEMA)
+    now = int(time.time())
+    notes, cards, n = [], [], 0
+    for it, de, conj, rec in rows:
+        n += 1
+        flds = "\x1f".join([it, "<br>".join(de), json.dumps(conj, ensure_ascii=False) if conj else ""])
+        notes.append((n, f"it{n}", 0, now, -1, "", flds, it, 0, 0, ""))
+        if rec:
+            cards.append((n, n, 1, 0, now, -1, 2, 2, int(rec["due"] // DAY), rec["interval"],
+                          int(rec["ease"] * 1000), 0, rec.get("lapses", 0), 0, 0, 0, 0, ""))
+        else:
+            cards.append((n, n, 1, 0, now, -1, 0, 0, n, 0, 2500, 0, 0, 0, 0, 0, 0, ""))
+        if len(notes) >= batch:
+            con.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+            con.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", cards)
+            notes, cards = [], []
+    con.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+    con.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", cards)
+    con.commit()
+    con.close()
+    return n
+
+
+def write_rows(rows, path, fmt=None):
+    fmt = fmt or detect_format(path)
+    if fmt == "tsv":
+        return write_delimited(rows, path, "\t")
+    if fmt == "anki":
+        return write_anki_text(rows, path)
+    if fmt == "sqlite":
+        return write_sqlite(rows, path)
+    return write_delimited(rows, path, ",")
+
+
+def write_lecture(rows, lecture_path, progress_path=None):
+    """Stream rows into a lecture JSON file (and their SRS records into a
+    progress file, merged over what is already there). Returns (entries, records)."""
+    existing = {}
+    if progress_path and os.path.exists(progress_path):
+        existing = load_json(progress_path)
+    n = n_rec = 0
+    tmp_lec = lecture_path + ".tmp"
+    prog = open(progress_path + ".tmp", "w", encoding="utf-8") if progress_path else None
+    try:
+        with open(tmp_lec, "w", encoding="utf-8") as lec:
+            lec.write("{")
+            if prog:
+                prog.write("{")
+            for it, de, conj, rec in rows:
+                value = {"de": de[0] if len(de) == 1 else de, "conjugation": conj}
+                lec.write(("," if n else "") + f"\n  {json.dumps(it, ensure_ascii=False)}: "
+                          + json.dumps(value, ensure_ascii=False))
+                n += 1
+                if prog and rec:
+                    key = it.lower().replace("’", "'").strip()
+                    existing.pop(key, None)
+                    prog.write(("," if n_rec else "") + json.dumps(key, ensure_ascii=False)
+                               + ":" + json.dumps(rec))
+                    n_rec += 1
+            lec.write("\n}\n")
+            if prog:
+                for key, rec in existing.items():
+                    prog.write(("," if n_rec else "") + json.dumps(key, ensure_ascii=False)
+                               + ":" + json.dumps(rec))
+                    n_rec += 1
+                prog.write("}")
+    finally:
+        if prog:
+            prog.close()
+    os.replace(tmp_lec, lecture_path)
+    if progress_path:
+        os.replace(progress_path + ".tmp", progress_path)
+    return n, n_rec
@@ -0,0 +1,164 @@
+import csv
+import html
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from jsonio import is_json, load_json
+
+HARD_EASE = 2.0            # at or below: the learner keeps failing the card
+SHORT_INTERVAL = 2         # days; at or below: (re)learning
+
+# A class directory holds one directory per learner with that learner's
+# srs_nouns_<dir>.json files and/or progress/<dir>/<lecture>.json shards, at
+# any depth. Per card and direction the report aggregates, over learners:
+#   [learners, ease sum, ease² sum, min ease, interval sum, hard, short, lapses]
+# Partials from different workers are merged by adding (min for min ease).
+N, EASE, EASE2, MIN_EASE, IVL, HARD, SHORT, LAPSES = range(8)
+
+
+# ── discovery ────────────────────────────────────────────
+def _direction(path):
+    parent, name = os.path.split(path)
+    return "de2it" if "de2it" in name or os.path.basename(parent) == "de2it" else "it2de"
+
+
+def learner_files(root):
+    """Learner directory → its noun progress files."""
+    out = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        parts = dirpath.split(os.sep)
+        for f in sorted(filenames):
+            if not is_json(f):
+                continue
+            if f.startswith("srs_nouns_"):
+                learner = dirpath
+            elif len(parts) >= 2 and parts[-2] == "progress":
+                learner = os.sep.join(parts[:-2]) or "."
+            else:
+                continue
+            out.setdefault(learner, []).append(os.path.join(dirpath, f))
+    return out
+
+
+# ── aggregation ──────────────────────────────────────────
+def learner_cards(paths):
+    """(direction, key) → record for one learner; the newest copy of a card wins."""
+    cards = {}
+    for p in paths:
+        d = _direction(p)
+        for key, rec in load_json(p).items():
+            if not isinstance(rec, dict) or "ease" not in rec:
+                continue
+            cur = cards.get((d, key))
+            if cur is None or rec.get("due", 0) > cur.get("due", 0):
+                cards[(d, key)] = rec
+    return cards
+
+
+def _add(stats, card, rec):
+    s = stats.get(card)
+    if s is None:
+        s = stats[card] = [0, 0.0, 0.0, math.inf, 0, 0, 0, 0]
+    ease = rec["ease"]
+    s[N] += 1
+    s[EASE] += ease
+    s[EASE2] += ease * ease
+    s[MIN_EASE] = min(s[MIN_EASE], ease)
+    s[IVL] += rec.get("interval", 1)
+    s[HARD] += ease <= HARD_EASE
+    s[SHORT] += rec.get("interval", 1) <= SHORT_INTERVAL
+    s[LAPSES] += rec.get("lapses", 0)
+
+
+def merge(into, part):
+    """Add the partial statistics `part` into `into` (both card → list)."""
+    for card, s in part.items():
+        t = into.get(card)
+        if t is None:
+            into[card] = list(s)
+            continue
+        for i in (N, EASE, EASE2, IVL, HARD, SHORT, LAPSES):
+            t[i] += s[i]
+        t[MIN_EASE] = min(t[MIN_EASE], s[MIN_EASE])
+    return into
+
+
+def _scan_batch(learners):
+    """Partial statistics for a batch of learners (runs in a worker process)."""
+    stats, errors = {}, []
+    for learner, paths in learners:
+        try:
+            cards = learner_cards(paths)
+        except (OSError, ValueError, EOFError) as e:
+            errors.append(f"{learner}: {e}")
+            continue
+        for card, rec in cards.items():
+            _add(stats, card, rec)
+    return stats, errors
+
+
+def scan(root, jobs=None):
+    """Statistics over every learner under `root`: (stats, learners, errors, seconds)."""
+    t0 = time.perf_counter()
+    learners = sorted(learner_files(root).items())
+    jobs = jobs or os.cpu_count() or 1
+    batch = max(1, math.ceil(len(learners) / (jobs * 4)))
+    stats, errors = {}, []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part, errs in pool.map(_scan_batch, [learners[i:i + batch]
+                                                 for i in range(0, len(learners), batch)]):
+            merge(stats, part)
+            errors += errs
+    return stats, len(learners), errors, time.perf_counter() - t0
+
+
+# ── report ───────────────────────────────────────────────
+def rows(stats, min_learners=1):
+    """Report rows, the cards the class struggles with most first."""
+    out = []
+    for (direction, key), s in stats.items():
+        n = s[N]
+        if n < min_learners:
+            continue
+        mean = s[EASE] / n
+        out.append({
+            "card": key,
+            "direction": direction,
+            "learners": n,
+            "hard_share": round(s[HARD] / n, 3),
+            "learning_share": round(s[SHORT] / n, 3),
+            "mean_ease": round(mean, 3),
+            "sd_ease": round(math.sqrt(max(0.0, s[EASE2] / n - mean * mean)), 3),
+            "min_ease": round(s[MIN_EASE], 2),
+            "mean_interval": round(s[IVL] / n, 1),
+            "lapses_per_learner": round(s[LAPSES] / n, 2),
+        })
+    out.sort(key=lambda r: (-r["hard_share"], r["mean_ease"], -r["learning_share"]))
+    return out
+
+
+def write_csv(report, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(report[0]) if report else ["card"])
+        w.writeheader()
+        w.writerows(report)
+
+
+def write_html(report, path, learners, title="Class report – nouns"):
+    cols = list(report[0]) if report else []
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<!doctype html><meta charset='utf-8'><title>{html.escape(title)}</title>\n"
+                "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+                "td,th{padding:2px 8px;border-bottom:1px solid #ddd;text-align:right}"
+                "td:first-child{text-align:left}</style>\n"
+                f"<h1>{html.escape(title)}</h1>\n<p>{learners} learner(s), {len(report)} card(s); "
+                f"'hard' = ease ≤ {HARD_EASE}, 'learning' = interval ≤ {SHORT_INTERVAL} days.</p>\n"
+                "<table>\n<tr>" + "".join(f"<th>{html.escape(c)}</th>" for c in cols) + "</tr>\n")
+        for r in report:
+            heat = int(255 * (1 - r["hard_share"]))
+            f.write(f"<tr style='background:rgb(255,{heat},{heat})'>"
+                    + "".join(f"<td>{html.escape(str(r[c]))}</td>" for c in cols) + "</tr>\n")
+        f.write("</table>\n")
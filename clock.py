@@ -0,0 +1,56 @@
+import datetime
+import os
+import random
+import time
+
+DAY = 86_400
+
+
+# ── clocks ───────────────────────────────────────────────
+# Anything that schedules takes a `clock` callable returning epoch seconds
+# (time.time by default) and anything that picks cards an `rng` with the
+# random.Random interface, so replays and benchmarks can pin both.
+class VirtualClock:
+    """Callable drop-in for time.time that only moves when told to."""
+
+    def __init__(self, start=1_750_000_000):
+        self.now = float(start)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def advance_days(self, days):
+        self.now += days * DAY
+
+
+class OffsetClock:
+    """Wall clock shifted by a fixed number of days (fast-forward in the GUI)."""
+
+    def __init__(self, days):
+        self.offset = days * DAY
+
+    def __call__(self):
+        return time.time() + self.offset
+
+
+def local_day(t):
+    """Day number of epoch time `t` in local time: days start at local midnight."""
+    return datetime.date.fromtimestamp(t).toordinal()
+
+
+def session_clock():
+    """time.time, shifted by TRAINER_TIME_OFFSET_DAYS days, or pinned at TRAINER_CLOCK_START."""
+    start = os.environ.get("TRAINER_CLOCK_START")
+    if start:
+        return VirtualClock(float(start))
+    days = float(os.environ.get("TRAINER_TIME_OFFSET_DAYS", "0") or 0)
+    return OffsetClock(days) if days else time.time
+
+
+def session_rng():
+    """A private Random, seeded from TRAINER_SEED when set."""
+    seed = os.environ.get("TRAINER_SEED")
+    return random.Random(int(seed) if seed else None)
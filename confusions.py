@@ -0,0 +1,45 @@
+import os
+from collections import Counter
+
+from jsonio import dump_json, load_json
+
+CONFUSION_FILE = "confusions.json"
+
+
+class ConfusionMatrix:
+    """How often the answer to one card was typed for another, per direction.
+
+    Stored as {direction: {card: {typed-for card: count}}}. `partners` is
+    symmetric: if 'il cane' was answered with the German for 'il gatto',
+    each of the two cards lists the other.
+    """
+
+    def __init__(self, path=CONFUSION_FILE):
+        self.path = path
+        self.counts = {}
+        if path and os.path.exists(path):
+            try:
+                self.counts = load_json(path)
+            except (OSError, ValueError):
+                self.counts = {}
+        self._partners = {}                  # (direction, card) → Counter
+        for direction, rows in self.counts.items():
+            for card, others in rows.items():
+                for other, n in others.items():
+                    self._link(direction, card, other, n)
+
+    def _link(self, direction, card, other, n):
+        self._partners.setdefault((direction, card), Counter())[other] += n
+        self._partners.setdefault((direction, other), Counter())[card] += n
+
+    def add(self, direction, card, other):
+        row = self.counts.setdefault(direction, {}).setdefault(card, {})
+        row[other] = row.get(other, 0) + 1
+        self._link(direction, card, other, 1)
+        if self.path:
+            dump_json(self.counts, self.path, ensure_ascii=False)
+
+    def partners(self, direction, card, limit=3):
+        """The cards most often confused with `card`, most frequent first."""
+        c = self._partners.get((direction, card))
+        return [k for k, _ in c.most_common(limit)] if c else []
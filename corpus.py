@@ -0,0 +1,239 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus_bin import BinaryCorpus, write_binary
+from jsonio import is_json, iter_object, open_text
+
+LECTURE_ROOT = "lectures"
+CORPUS_FILE = "corpus.json"
+BINARY_FILE = "corpus.bin"
+CORPUS_VERSION = 1
+
+
+# ── validation / normalisation of one lecture file ───────
+def norm_key(k: str) -> str:
+    return " ".join(k.replace("’", "'").split())
+
+
+def _norm_de(de):
+    if isinstance(de, str):
+        return de.strip()
+    if isinstance(de, list) and all(isinstance(d, str) for d in de):
+        de = [d.strip() for d in de if d.strip()]
+        return de[0] if len(de) == 1 else de
+    return None
+
+
+def _meanings(de):
+    """Comparable set of translations: lower-case, without der/die/das."""
+    out = set()
+    for d in ([de] if isinstance(de, str) else de):
+        d = d.lower()
+        for art in ("der ", "die ", "das "):
+            if d.startswith(art):
+                d = d[len(art):]
+        out.add(d)
+    return out
+
+
+def _is_conjugation(v):
+    return isinstance(v, dict) and v and all(isinstance(x, str) for x in v.values())
+
+
+def check_file(path, root=LECTURE_ROOT):
+    """Validate and normalise one lecture file.
+
+    Returns (name, entries, errors, warnings) where `name` is the path
+    relative to `root` and `entries` is a list of (key, de, conjugation).
+    Runs in a worker process, so it only returns plain data.
+    """
+    name = os.path.relpath(path, root).replace(os.sep, "/")
+    errors, warnings, entries = [], [], []
+    dupes = []
+
+    def pairs_hook(kv):                    # nested objects
+        seen = set()
+        for k, _ in kv:
+            if k in seen:
+                dupes.append(k)
+            seen.add(k)
+        return dict(kv)
+
+    content = {}
+    try:
+        with open_text(path) as f:           # plain, .gz, .xz or .zst
+            for k, v in iter_object(f, json.JSONDecoder(object_pairs_hook=pairs_hook)):
+                if k in content:
+                    dupes.append(k)
+                content[k] = v
+    except (OSError, ValueError, EOFError) as e:
+        return name, [], [f"{name}: unreadable: {e}"], []
+    for k in dupes:
+        warnings.append(f"{name}: duplicate key {k!r}, last one wins")
+
+    seen = {}
+    for raw_key, v in content.items():
+        key = norm_key(raw_key)
+        where = f"{name}: {raw_key!r}"
+        if not key:
+            errors.append(f"{where}: empty key")
+            continue
+        if not isinstance(v, dict):
+            errors.append(f"{where}: entry is not an object")
+            continue
+        if "de" not in v and "translation" in v:   # older lecture format
+            warnings.append(f"{where}: 'translation' instead of 'de'")
+            v = dict(v, de=v.pop("translation"))
+        if "de" not in v:
+            if _is_conjugation(v):                # bare conjugation table
+                warnings.append(f"{where}: no 'de' wrapper, treated as conjugation")
+                v = {"de": "", "conjugation": v}
+            else:
+                errors.append(f"{where}: missing 'de'")
+                continue
+        de = _norm_de(v["de"])
+        if de is None:
+            errors.append(f"{where}: 'de' must be a string or list of strings")
+            continue
+        conj = v.get("conjugation") or None
+        if conj is not None and not _is_conjugation(conj):
+            errors.append(f"{where}: malformed conjugation")
+            conj = None
+        if not de:
+            if not conj:                          # untranslated draft entry
+                warnings.append(f"{where}: no translation yet, skipped")
+                continue
+            warnings.append(f"{where}: empty translation")
+        extra = set(v) - {"de", "conjugation"}
+        if extra:
+            warnings.append(f"{where}: ignoring fields {sorted(extra)}")
+        if key in seen:
+            warnings.append(f"{where}: same key as {seen[key]!r} after normalisation")
+        seen[key] = raw_key
+        entries.append((key, de, conj))
+    return name, entries, errors, warnings
+
+
+def lecture_paths(root=LECTURE_ROOT):
+    out = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        out.extend(os.path.join(dirpath, f) for f in sorted(filenames) if is_json(f))
+    return out
+
+
+def _sources(paths, root):
+    src = {}
+    for p in paths:
+        st = os.stat(p)
+        src[os.path.relpath(p, root).replace(os.sep, "/")] = [st.st_mtime_ns, st.st_size]
+    return src
+
+
+# ── compilation ──────────────────────────────────────────
+def compile_lectures(root=LECTURE_ROOT, out=CORPUS_FILE, jobs=None, write=True, binary=BINARY_FILE):
+    """Validate every lecture under `root` in parallel and write one corpus.
+
+    Identical (key, de, conjugation) entries are stored once and referenced
+    by index from every lecture that contains them. Besides the JSON corpus
+    `out`, the mmap-able binary form is written to `binary` unless that is
+    None. Returns (errors, warnings).
+    """
+    paths = lecture_paths(root)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(check_file, paths, [root] * len(paths)))
+
+    entries, ids, lectures = [], {}, {}
+    errors, warnings = [], []
+    owner = {}
+    for name, part, errs, warns in results:
+        errors += errs
+        warnings += warns
+        refs = []
+        for key, de, conj in part:
+            row = [key, de] + ([conj] if conj else [])
+            sig = json.dumps(row, sort_keys=True, ensure_ascii=False)
+            if sig not in ids:
+                ids[sig] = len(entries)
+                entries.append(row)
+            kind = name.split("/", 1)[0]
+            prev = owner.setdefault((kind, key), (name, de))
+            if prev[0] != name and not _meanings(prev[1]) & _meanings(de):
+                warnings.append(f"{name}: {key!r} also in {prev[0]} with a different translation")
+            refs.append(ids[sig])
+        lectures[name] = refs
+
+    if write and not errors:
+        data = {
+            "version": CORPUS_VERSION,
+            "sources": _sources(paths, root),
+            "entries": entries,
+            "lectures": lectures,
+        }
+        tmp = out + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, out)
+        if binary:
+            write_binary(data, binary)
+    return errors, warnings
+
+
+# ── loading ──────────────────────────────────────────────
+class Corpus:
+    def __init__(self, data):
+        self.entries = data["entries"]
+        self.lectures = data["lectures"]
+
+    def names(self, kind=None):
+        """Lecture names like 'nouns/nouns_lecture_1.json', optionally of one kind."""
+        return [n for n in self.lectures if kind is None or n.startswith(kind + "/")]
+
+    def lecture(self, name):
+        out = {}
+        for i in self.lectures.get(name, ()):
+            row = self.entries[i]
+            out[row[0]] = {"de": row[1], "conjugation": row[2] if len(row) > 2 else {}}
+        return out
+
+
+_cache = {}
+
+
+def _fresh(sources, root):
+    try:
+        return _sources(lecture_paths(root), root) == sources
+    except OSError:
+        return False
+
+
+def load_corpus(path=CORPUS_FILE, root=LECTURE_ROOT, binary=BINARY_FILE):
+    """The compiled corpus, or None if missing or older than the lecture files.
+
+    Prefers the memory-mapped binary corpus, whose lectures are lazy
+    mappings; falls back to the JSON corpus.
+    """
+    try:
+        mtime = os.stat(binary).st_mtime_ns
+        hit = _cache.get(binary)
+        if not hit or hit[0] != mtime:
+            hit = _cache[binary] = (mtime, BinaryCorpus(binary))
+        if _fresh(hit[1].sources, root):
+            return hit[1]
+    except (OSError, ValueError):
+        pass
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    hit = _cache.get(path)
+    if hit and hit[0] == mtime:
+        data = hit[1]
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CORPUS_VERSION:
+            return None
+        _cache[path] = (mtime, data)
+    return Corpus(data) if _fresh(data["sources"], root) else None
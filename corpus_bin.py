@@ -0,0 +1,177 @@
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import Mapping
+
+# ── on-disk layout ───────────────────────────────────────
+# header    MAGIC, version, counts and section offsets (HEADER)
+# strings   n_strings + 1 u32 offsets into the UTF-8 blob (string i ends where i+1 starts)
+# records   n_records × (key, de, conjugation, flags) string ids, u32 each
+# lectures  n_lectures × (name, first ref, ref count), u32 each
+# refs      record ids per lecture, sorted by key bytes for binary search
+# blob      all strings, each stored once
+MAGIC = b"ITCB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH10I")
+STR = struct.Struct("<I")
+STR2 = struct.Struct("<II")
+REC = struct.Struct("<IIII")
+LEC = struct.Struct("<III")
+REF = struct.Struct("<I")
+NONE = 0xFFFFFFFF
+DE_LIST = 1
+SEP, ROW = "\x1f", "\x1e"
+
+
+def write_binary(data, path):
+    """Write a compiled corpus (as built by corpus.compile_lectures) to `path`."""
+    strings, sid = [], {}
+
+    def intern(s):
+        if s not in sid:
+            sid[s] = len(strings)
+            strings.append(s)
+        return sid[s]
+
+    records = []
+    for key, de, *conj in data["entries"]:
+        flags = DE_LIST if isinstance(de, list) else 0
+        de_s = SEP.join(de) if flags else de
+        conj_s = ROW.join(f"{p}{SEP}{f}" for p, f in conj[0].items()) if conj else None
+        records.append((intern(key), intern(de_s),
+                        NONE if conj_s is None else intern(conj_s), flags))
+
+    lectures, refs = [], []
+    for name, ids in data["lectures"].items():
+        ids = sorted(ids, key=lambda i: data["entries"][i][0].encode("utf-8"))
+        lectures.append((intern(name), len(refs), len(ids)))
+        refs.extend(ids)
+    sources = intern(json.dumps(data["sources"], sort_keys=True))
+
+    blob, index = bytearray(), []
+    for s in strings:
+        index.append(len(blob))
+        blob += s.encode("utf-8")
+    index.append(len(blob))
+
+    str_off = HEADER.size
+    rec_off = str_off + STR.size * len(index)
+    lec_off = rec_off + REC.size * len(records)
+    ref_off = lec_off + LEC.size * len(lectures)
+    blob_off = ref_off + REF.size * len(refs)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(strings), len(records), len(lectures),
+                            len(refs), str_off, rec_off, lec_off, ref_off, blob_off, sources))
+        for off in index:
+            f.write(STR.pack(off))
+        for rec in records:
+            f.write(REC.pack(*rec))
+        for lec in lectures:
+            f.write(LEC.pack(*lec))
+        for r in refs:
+            f.write(REF.pack(r))
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+# ── lazy reader ──────────────────────────────────────────
+class BinaryCorpus:
+    """Memory-mapped corpus; entries are decoded only when looked up."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.n_strings, self.n_records, self.n_lectures, self.n_refs,
+         self._str, self._rec, self._lec, self._ref, self._blob, src) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a corpus file (v{VERSION})")
+        self.sources = json.loads(self.string(src))
+        self._names = {}
+        for i in range(self.n_lectures):
+            name, first, n = LEC.unpack_from(self._mm, self._lec + i * LEC.size)
+            self._names[self.string(name)] = (first, n)
+
+    def raw(self, sid):
+        start, end = STR2.unpack_from(self._mm, self._str + sid * STR.size)
+        return self._mm[self._blob + start:self._blob + end]
+
+    def string(self, sid):
+        return self.raw(sid).decode("utf-8")
+
+    def record_id(self, ref):
+        return REF.unpack_from(self._mm, self._ref + ref * REF.size)[0]
+
+    def key_raw(self, rid):
+        return self.raw(REC.unpack_from(self._mm, self._rec + rid * REC.size)[0])
+
+    def entry(self, rid):
+        key, de, conj, flags = REC.unpack_from(self._mm, self._rec + rid * REC.size)
+        de = self.string(de)
+        if flags & DE_LIST:
+            de = de.split(SEP)
+        conjugation = {}
+        if conj != NONE:
+            for row in self.string(conj).split(ROW):
+                p, form = row.split(SEP, 1)
+                conjugation[p] = form
+        return {"de": de, "conjugation": conjugation}
+
+    def names(self, kind=None):
+        return [n for n in self._names if kind is None or n.startswith(kind + "/")]
+
+    def lecture(self, name):
+        first, n = self._names.get(name, (0, 0))
+        return LectureView(self, first, n)
+
+
+class _KeySeq:
+    """Sorted key bytes of a LectureView as a sequence, for bisect."""
+
+    def __init__(self, view):
+        self._view = view
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, i):
+        return self._view._key_at(i)
+
+
+class LectureView(Mapping):
+    """Read-only mapping key → entry over one lecture of a BinaryCorpus."""
+
+    def __init__(self, corpus, first, n):
+        self._c, self._first, self._n = corpus, first, n
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        c = self._c
+        for r in range(self._first, self._first + self._n):
+            yield c.key_raw(c.record_id(r)).decode("utf-8")
+
+    def _key_at(self, i):
+        return self._c.key_raw(self._c.record_id(self._first + i))
+
+    def _find(self, key):
+        if not isinstance(key, str):
+            return None
+        target = key.encode("utf-8")
+        i = bisect_left(_KeySeq(self), target)
+        if i < self._n and self._key_at(i) == target:
+            return self._c.record_id(self._first + i)
+        return None
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        rid = self._find(key)
+        if rid is None:
+            raise KeyError(key)
+        return self._c.entry(rid)
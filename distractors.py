@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+from indexes import de_list, strip_de_article
+from italian_text import noun_root
+from jsonio import dump_json, load_json
+from matching import fold
+
+TABLE_FILE = "distractors.json"
+NEIGHBOURS = 8             # candidates kept per card and direction
+MAX_POSTING = 200          # trigrams shared by more cards say little; skipped
+TABLE_VERSION = 2          # part of the cache signature; bump when scoring changes
+
+# For every card the table keeps the cards whose answer looks most like its
+# own: shared character trigrams (Jaccard) plus a bonus for the same gender
+# and the same lecture. Cards sharing a German meaning with it are never
+# candidates (la tavola / il tavolo: both right for "der Tisch"). Computed
+# once per corpus and cached on disk, so a question only reads a short list.
+
+
+def _trigrams(txt):
+    txt = f"  {txt} "
+    return {txt[i:i + 3] for i in range(len(txt) - 2)}
+
+
+def _it_gender(key):
+    k = fold(key)
+    if k.startswith(("il ", "lo ", "i ", "gli ")):
+        return "m"
+    if k.startswith(("la ", "le ")):
+        return "f"
+    if k.startswith("l'"):
+        return "f" if noun_root(k).endswith("a") else "m"
+    return ""
+
+
+def _de_gender(de):
+    return {"der": "m", "die": "f", "das": "n"}.get(fold(de).split(" ", 1)[0], "")
+
+
+def _meanings(entry):
+    """German translations, article stripped and accents folded."""
+    return {fold(strip_de_article(d)) for d in de_list(entry) if d}
+
+
+def _answers(vocab, direction):
+    """card → (answer text, gender) for the side the learner picks from."""
+    out = {}
+    for key, entry in vocab.items():
+        if direction == "de2it":
+            out[key] = (noun_root(key), _it_gender(key))
+        else:
+            de = de_list(entry)[0] if de_list(entry) else ""
+            out[key] = (fold(strip_de_article(de)), _de_gender(de))
+    return out
+
+
+def _neighbours(answers, meanings, origin, k):
+    grams = {key: _trigrams(txt) for key, (txt, _) in answers.items() if txt}
+    posting = {}
+    for key, gs in grams.items():
+        for g in gs:
+            posting.setdefault(g, []).append(key)
+    table = {}
+    for key, gs in grams.items():
+        text, gender = answers[key]
+        shared = Counter()
+        for g in gs:
+            cards = posting[g]
+            if len(cards) <= MAX_POSTING:
+                shared.update(cards)
+        scored = []
+        for other, n in shared.items():
+            other_text, other_gender = answers[other]
+            if other == key or other_text == text or meanings[key] & meanings[other]:
+                continue                     # a right answer too is no distractor
+            score = n / (len(gs) + len(grams[other]) - n)
+            score += 0.3 * (gender == other_gender != "")
+            score += 0.2 * (origin.get(key) == origin.get(other))
+            scored.append((-score, other))
+        table[key] = [o for _, o in sorted(scored)[:k]]
+    return table
+
+
+def signature(vocab, origin):
+    h = hashlib.blake2b(digest_size=12)
+    h.update(str(TABLE_VERSION).encode())
+    for key in sorted(vocab):
+        h.update(json.dumps([key, vocab[key]["de"], origin.get(key)], ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_table(vocab, origin, k=NEIGHBOURS):
+    meanings = {key: _meanings(entry) for key, entry in vocab.items()}
+    return {d: _neighbours(_answers(vocab, d), meanings, origin, k) for d in ("it2de", "de2it")}
+
+
+def load_table(vocab, origin, path=TABLE_FILE):
+    """The neighbour table for this corpus: from the cache file, else built and cached."""
+    sig = signature(vocab, origin)
+    if path and os.path.exists(path):
+        try:
+            data = load_json(path)
+            if data.get("signature") == sig:
+                return data["table"]
+        except (OSError, ValueError):
+            pass
+    table = build_table(vocab, origin)
+    if path:
+        dump_json({"signature": sig, "table": table}, path, ensure_ascii=False)
+    return table
+
+
+def choices(table, direction, key, vocab, deck, rng, n=4):
+    """`n` options for `key`: its answer and the nearest distractors, shuffled.
+
+    Options are German translations (IT→DE) or Italian keys (DE→IT). Cards
+    with too few neighbours are topped up with random cards from `deck`.
+    """
+    def shown(k):
+        return k if direction == "de2it" else de_list(vocab[k])[0]
+
+    mine = _meanings(vocab[key])
+
+    def usable(k):
+        return k in vocab and shown(k) not in opts and not mine & _meanings(vocab[k])
+
+    right = shown(key)
+    opts = [right]
+    for other in table.get(direction, {}).get(key, ()):
+        if usable(other):
+            opts.append(shown(other))
+        if len(opts) == n:
+            break
+    for _ in range(10 * n):
+        if len(opts) == n or not deck:
+            break
+        other = rng.choice(deck)
+        if usable(other):
+            opts.append(shown(other))
+    rng.shuffle(opts)
+    return right, opts
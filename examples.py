@@ -0,0 +1,93 @@
+import json
+import os
+
+from italian_text import iter_sentences, noun_root, singulars, tokens
+
+TEXT_DIR = "texts"
+INDEX_FILE = "examples_index.json"
+PER_LEMMA = 20            # sentences kept per lemma
+MAX_SENTENCE = 300        # characters; longer ones make poor examples
+
+
+# ── ingestion ────────────────────────────────────────────
+def text_paths(root=TEXT_DIR):
+    out = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        out.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith(".txt"))
+    return out
+
+
+def build_index(paths, out=INDEX_FILE):
+    """Tokenise the source texts and write lemma → sentence ids.
+
+    Each token is indexed under itself and its naive singular forms, so
+    'gatti' in a text is found for the card 'il gatto'. Texts are read line
+    by line; only sentences that end up in the index are kept in memory.
+    """
+    sentences, ids, index = [], {}, {}
+    for path in paths:
+        src = os.path.basename(path)
+        with open(path, encoding="utf-8") as f:
+            for sent in iter_sentences(f):
+                if len(sent) > MAX_SENTENCE:
+                    continue
+                sid = None
+                for tok in set(tokens(sent)):
+                    if tok.endswith("'"):
+                        continue
+                    for lemma in singulars(tok):
+                        bucket = index.setdefault(lemma, [])
+                        if len(bucket) >= PER_LEMMA:
+                            continue
+                        if sid is None:
+                            sid = ids.get(sent)
+                            if sid is None:
+                                sid = ids[sent] = len(sentences)
+                                sentences.append([sent, src])
+                        if not bucket or bucket[-1] != sid:
+                            bucket.append(sid)
+    data = {"sentences": sentences, "index": index}
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    return len(sentences), len(index)
+
+
+# ── lookup ───────────────────────────────────────────────
+class ExampleIndex:
+    def __init__(self, data):
+        self.sentences = data["sentences"]
+        self.index = data["index"]
+
+    def examples(self, key, limit=3):
+        """Example sentences for a card key such as 'il gatto' or 'la sala da pranzo'."""
+        root = noun_root(key)
+        words = root.split()
+        if not words:
+            return []
+        out = []
+        for sid in self.index.get(words[0], ()):
+            sent, src = self.sentences[sid]
+            # multi-word nouns: the head word must be followed by the rest
+            if len(words) > 1 and root not in " ".join(tokens(sent)):
+                continue
+            out.append((sent, src))
+            if len(out) >= limit:
+                break
+        return out
+
+
+_loaded = {}
+
+
+def load_examples(path=INDEX_FILE):
+    """The example index (cached per file version), or None if not built."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    hit = _loaded.get(path)
+    if not hit or hit[0] != mtime:
+        with open(path, encoding="utf-8") as f:
+            hit = _loaded[path] = (mtime, ExampleIndex(json.load(f)))
+    return hit[1]
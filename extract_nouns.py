@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+from corpus import load_corpus, lecture_paths, check_file
+
+DRAFT_DIR = "drafts"       # not loaded by the trainers; move files to lectures/nouns/ when done
+
+# article / articulated preposition → singular definite article of the noun
+SINGULAR = {
+    "il": "il", "del": "il", "al": "il", "dal": "il", "nel": "il", "sul": "il", "col": "il",
+    "lo": "lo", "dello": "lo", "allo": "lo", "dallo": "lo", "nello": "lo", "sullo": "lo",
+    "la": "la", "della": "la", "alla": "la", "dalla": "la", "nella": "la", "sulla": "la",
+    "l'": "l'", "dell'": "l'", "all'": "l'", "dall'": "l'", "nell'": "l'", "sull'": "l'",
+}
+PLURAL = {
+    "i": "il", "dei": "il", "ai": "il", "dai": "il", "nei": "il", "sui": "il",
+    "gli": "lo", "degli": "lo", "agli": "lo", "dagli": "lo", "negli": "lo", "sugli": "lo",
+    "le": "la", "delle": "la", "alle": "la", "dalle": "la", "nelle": "la", "sulle": "la",
+}
+# words that follow an article but are not nouns (pronouns, adjectives, …)
+STOP = frozenset("""
+    altro altra altri altre stesso stessa stessi stesse primo prima primi prime
+    ultimo ultima ultimi ultime mio mia miei mie tuo tua tuoi tue suo sua suoi sue
+    nostro nostra nostri nostre vostro vostra vostri vostre loro quale quali cui
+    più meno tutto tutta tutti tutte solito solita vero vera nuovo nuova grande
+    piccolo piccola bello bella buon buona vecchio vecchia giovane stesso altri
+    secondo seconda terzo terza quel quello quella quei quegli quelle
+    """.split())
+
+# bare articles that are also object pronouns: 'la vede', 'lo prende', "l'aveva";
+# after a preposition or tutto/tutta they are articles ('con la ragazza')
+CLITICS = frozenset(("lo", "la", "l'", "le", "gli"))
+ARTICLE_CUES = frozenset("con per tra fra su in di a da verso senza contro sotto sopra "
+                         "tutto tutta tutti tutte".split())
+
+_ARTS = sorted(set(SINGULAR) | set(PLURAL), key=len, reverse=True)
+# one finite-state pass: article (or elided article glued to the noun) + word
+PAIR = re.compile(
+    r"(?<![a-zàèéìíòóùú'])(" + "|".join(re.escape(a) for a in _ARTS if a.endswith("'")) + r")"
+    r"([a-zàèéìíòóùú]{3,})"
+    r"|(?<![a-zàèéìíòóùú'])(" + "|".join(re.escape(a) for a in _ARTS if not a.endswith("'")) + r")"
+    r"\s+([a-zàèéìíòóùú]{3,})(?![a-zàèéìíòóùú'])",
+)
+
+
+def key_hash(key: str) -> int:
+    k = " ".join(key.lower().replace("’", "'").split())
+    return int.from_bytes(hashlib.blake2b(k.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def known_noun_hashes(root="lectures"):
+    """64-bit hashes of every noun key already in a lecture."""
+    corpus = load_corpus(root=root)
+    if corpus:
+        return {key_hash(k) for name in corpus.names("nouns") for k in corpus.lecture(name)}
+    return {key_hash(k) for p in lecture_paths(os.path.join(root, "nouns"))
+            for k, _, _ in check_file(p, root)[1]}
+
+
+def _singular(art, word):
+    base = PLURAL[art]
+    if word.endswith(("chi", "ghi")):
+        return base, [word[:-2] + "o"]
+    if word.endswith(("che", "ghe")):
+        return "la", [word[:-2] + "a"]
+    if word.endswith("i"):
+        return base, [word[:-1] + "o", word[:-1] + "e"]
+    if word.endswith("e") and base == "la":
+        return "la", [word[:-1] + "a"]
+    return base, [word]
+
+
+def _vowel(word):
+    return word[0] in "aeiouàèéìòóù"
+
+
+def _key(art, word):
+    if art in ("lo", "la") and _vowel(word):
+        art = "l'"
+    if art == "il" and _vowel(word):
+        art = "l'"
+    return f"l’{word}" if art == "l'" else f"{art} {word}"
+
+
+def _cued(line, pos):
+    """True if the word before position `pos` marks what follows as an article."""
+    before = line[max(0, pos - 12):pos].split()
+    return bool(before) and before[-1] in ARTICLE_CUES
+
+
+# ── extraction ───────────────────────────────────────────
+def count_nouns(lines):
+    """Counts of singular 'article noun' keys, streaming over text lines.
+
+    A key only seen after a bare lo/la/l'/le/gli may be a pronoun and a verb
+    ('la vede'); it is kept once il, i, an articulated preposition (della,
+    nell', …) or a preposition before the article confirms it as a noun.
+    """
+    singular, plural, confirmed = Counter(), Counter(), set()
+    for line in lines:
+        line = line.lower().replace("’", "'")
+        for m in PAIR.finditer(line):
+            art, word = (m.group(1), m.group(2)) if m.group(1) else (m.group(3), m.group(4))
+            if word in STOP:
+                continue
+            if art in SINGULAR:
+                k = _key(SINGULAR[art], word)
+                singular[k] += 1
+                if art not in CLITICS or _cued(line, m.start()):
+                    confirmed.add(k)
+            else:
+                plural[(art, word, art not in CLITICS or _cued(line, m.start()))] += 1
+    # a plural only counts towards a singular that the text itself confirms
+    for (art, word, sure), n in plural.items():
+        base, candidates = _singular(art, word)
+        for cand in candidates:
+            k = _key(base, cand)
+            if k in singular:
+                singular[k] += n
+                if sure:
+                    confirmed.add(k)
+                break
+    return Counter({k: n for k, n in singular.items() if k in confirmed})
+
+
+def extract(text_path, known=None, top=50, min_count=2):
+    """Most frequent nouns of a text that are not in any lecture yet."""
+    with open(text_path, encoding="utf-8") as f:
+        counts = count_nouns(f)
+    known = known_noun_hashes() if known is None else known
+    ranked = [(k, n) for k, n in counts.most_common() if n >= min_count and key_hash(k) not in known]
+    return ranked[:top]
+
+
+def write_lecture(ranked, path):
+    """Draft lecture file; 'de' is left empty for the translations to be filled in.
+
+    Drafts belong outside lectures/ (see DRAFT_DIR) until they are translated;
+    entries without a translation are skipped by the trainers anyway.
+    """
+    lecture = {k: {"de": "", "conjugation": {}} for k, _ in ranked}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(lecture, f, ensure_ascii=False, indent=2)
+    return len(lecture)
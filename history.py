@@ -0,0 +1,54 @@
+import os
+from array import array
+
+# long kiosk sessions can raise this via the environment
+HISTORY_SIZE = int(os.environ.get("TRAINER_HISTORY_SIZE", "200"))
+
+
+# ── bounded next/previous history ────────────────────────
+class NavHistory:
+    """Ring buffer of card ids with browser-style back/forward.
+
+    Stores ints (e.g. `DueSampler.index[key]`) in a fixed `array`, so memory
+    stays constant however long the session runs; the oldest entries are
+    overwritten once `size` is reached.
+    """
+
+    def __init__(self, size=None):
+        self.size = max(1, size or HISTORY_SIZE)
+        self._buf = array("l", [0]) * self.size
+        self._start = 0        # slot of the oldest entry
+        self._len = 0          # entries stored
+        self._pos = -1         # cursor, 0 … _len-1 (relative to _start)
+
+    def __len__(self):
+        return self._len
+
+    def _slot(self, rel):
+        return (self._start + rel) % self.size
+
+    def clear(self):
+        self._start, self._len, self._pos = 0, 0, -1
+
+    def push(self, card_id):
+        """Record a newly drawn card; drops anything ahead of the cursor."""
+        self._len = self._pos + 1
+        if self._len == self.size:
+            self._start = (self._start + 1) % self.size
+            self._len -= 1
+        self._buf[self._slot(self._len)] = card_id
+        self._len += 1
+        self._pos = self._len - 1
+
+    def back(self):
+        if self._pos <= 0:
+            return None
+        self._pos -= 1
+        return self._buf[self._slot(self._pos)]
+
+    def forward(self):
+        """Next card after going back, or None when already at the newest."""
+        if self._pos >= self._len - 1:
+            return None
+        self._pos += 1
+        return self._buf[self._slot(self._pos)]
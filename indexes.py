@@ -0,0 +1,85 @@
+from italian_text import noun_root
+from matching import fold, norm
+
+DE_ARTICLES = ("der ", "die ", "das ")
+
+
+def strip_de_article(de: str) -> str:
+    de = norm(de)
+    for art in DE_ARTICLES:
+        if de.startswith(art):
+            return de[len(art):]
+    return de
+
+
+def de_list(entry):
+    de = entry["de"]
+    return de if isinstance(de, list) else [de]
+
+
+# ── German → Italian ─────────────────────────────────────
+class ReverseIndex:
+    """Normalised German form → every Italian key that translates to it.
+
+    Each translation is indexed both with and without der/die/das, so
+    "die Zeit" and "Zeit" hit the same bucket. Built once per lecture load.
+    """
+
+    def __init__(self, vocab):
+        self._idx = {}
+        for it_key, entry in vocab.items():
+            for de in de_list(entry):
+                if not de:
+                    continue
+                for form in {norm(de), strip_de_article(de)}:
+                    bucket = self._idx.setdefault(form, [])
+                    if it_key not in bucket:
+                        bucket.append(it_key)
+
+    def __len__(self):
+        return len(self._idx)
+
+    def italian_for(self, de: str):
+        """All Italian keys accepted for the German prompt `de`.
+
+        Both buckets count: a synonym may only be listed without the article.
+        """
+        out = list(self._idx.get(norm(de), ()))
+        out += [k for k in self._idx.get(strip_de_article(de), ()) if k not in out]
+        return out
+
+
+# ── answer → cards (confusions) ──────────────────────────
+class AnswerIndex:
+    """Normalised answer → every card it is the correct answer for.
+
+    Built once over the whole noun corpus, not just the ticked lectures.
+    German answers (IT→DE) are indexed without der/die/das, Italian ones
+    (DE→IT) with and without their article; both accent-folded. A wrong
+    answer found here was meant for another card: a confusion.
+    """
+
+    def __init__(self, vocab):
+        self._de, self._it = {}, {}
+        for it_key, entry in vocab.items():
+            for de in de_list(entry):
+                if de:
+                    self._put(self._de, fold(strip_de_article(de)), it_key)
+            for form in {fold(it_key), fold(noun_root(it_key))}:
+                self._put(self._it, form, it_key)
+
+    @staticmethod
+    def _put(idx, form, key):
+        bucket = idx.setdefault(form, [])
+        if key not in bucket:
+            bucket.append(key)
+
+    def cards_for(self, answer: str, reverse=False):
+        """Cards whose answer is `answer` (Italian answers when `reverse`)."""
+        if reverse:
+            return self._it.get(fold(answer), [])
+        return self._de.get(fold(strip_de_article(answer)), [])
+
+    def other_cards(self, answer: str, reverse=False, mine=()):
+        """Cards outside `mine` that `answer` is right for (accents aside)."""
+        return [k for k in self.cards_for(answer, reverse) if k not in mine]
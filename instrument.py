@@ -0,0 +1,123 @@
+import atexit
+import json
+import os
+import time
+from functools import wraps
+
+# TRAINER_INSTRUMENT=1 turns everything on; otherwise `timed` returns the
+# function untouched and `count` does nothing, so the hot path pays nothing.
+ENABLED = os.environ.get("TRAINER_INSTRUMENT", "") not in ("", "0")
+DUMP_FILE = os.environ.get("TRAINER_INSTRUMENT_OUT", "instrument.json")
+
+
+# ── metrics ──────────────────────────────────────────────
+class Timer:
+    """Count, total, max and a log2 histogram of durations in µs."""
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count, self.total, self.max = 0, 0.0, 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        us = seconds * 1e6
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+        b = int(us).bit_length()        # bucket b holds [2^(b-1), 2^b) µs
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, q):
+        """Upper bound (µs) of the bucket containing the q-quantile."""
+        if not self.count:
+            return 0
+        seen, rank = 0, q * self.count
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return 1 << b
+        return 1 << max(self.buckets)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_us": round(self.total, 1),
+            "mean_us": round(self.total / self.count, 1) if self.count else 0,
+            "max_us": round(self.max, 1),
+            "p50_us": self.percentile(0.5),
+            "p95_us": self.percentile(0.95),
+            "hist_log2_us": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+
+timers = {}
+counters = {}
+
+
+def record(name, seconds):
+    t = timers.get(name)
+    if t is None:
+        t = timers[name] = Timer()
+    t.add(seconds)
+
+
+def count(name, n=1):
+    if ENABLED:
+        counters[name] = counters.get(name, 0) + n
+
+
+def timed(name):
+    """Decorator timing every call of the function under `name`."""
+    def deco(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+        return wrapper
+    return deco
+
+
+def snapshot():
+    return {
+        "timers": {k: v.as_dict() for k, v in sorted(timers.items())},
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def dump(path=None):
+    with open(path or DUMP_FILE, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
+
+
+if ENABLED:
+    atexit.register(dump)
+
+
+# ── Tk overlay ───────────────────────────────────────────
+def overlay(root, every_ms=500):
+    """Small live table of timings at the bottom of a trainer window."""
+    if not ENABLED:
+        return None
+    import tkinter as tk
+
+    lbl = tk.Label(root, text="", font=("Courier", 9), justify="left", fg="gray30")
+    lbl.pack(side="bottom", anchor="w")
+
+    def refresh():
+        if not lbl.winfo_exists():
+            return
+        lines = [f"{k:<22} n={t.count:<5} p50≤{t.percentile(0.5)}µs max={t.max:.0f}µs"
+                 for k, t in sorted(timers.items())]
+        lines += [f"{k:<22} {v}" for k, v in sorted(counters.items())]
+        lbl.config(text="\n".join(lines))
+        root.after(every_ms, refresh)
+
+    refresh()
+    return lbl
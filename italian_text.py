@@ -0,0 +1,62 @@
+import re
+
+# letters incl. accented vowels; apostrophes are split off (l'acqua → l', acqua)
+WORD = re.compile(r"[a-zàèéìíòóùú]+'?", re.IGNORECASE)
+SENTENCE_END = re.compile(r"(?<=[.!?…])[\"»”’)]*\s+")
+ARTICLES = ("il", "lo", "la", "i", "gli", "le", "l'", "un", "uno", "una", "un'")
+
+
+def fold_apostrophes(txt: str) -> str:
+    return txt.replace("’", "'").replace("`", "'")
+
+
+def tokens(txt: str):
+    """Lower-case word tokens; elided articles keep their apostrophe."""
+    return [t.lower() for t in WORD.findall(fold_apostrophes(txt))]
+
+
+def iter_sentences(lines):
+    """Sentences from an iterable of text lines (e.g. an open file), streaming.
+
+    Blank lines end a sentence too, so headings do not glue onto paragraphs.
+    """
+    buf = ""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if buf.strip():
+                yield " ".join(buf.split())
+            buf = ""
+            continue
+        buf = f"{buf} {line}" if buf else line
+        parts = SENTENCE_END.split(buf)
+        for s in parts[:-1]:
+            if s.strip():
+                yield " ".join(s.split())
+        buf = parts[-1]
+    if buf.strip():
+        yield " ".join(buf.split())
+
+
+def singulars(word: str):
+    """The word plus naive singular candidates for regular plurals."""
+    out = {word}
+    if len(word) > 3:
+        if word.endswith("i"):
+            out.update((word[:-1] + "o", word[:-1] + "e"))
+        elif word.endswith("e"):
+            out.add(word[:-1] + "a")
+        if word.endswith(("chi", "ghi")):
+            out.add(word[:-2] + "o")           # tedeschi → tedesco
+        if word.endswith(("che", "ghe")):
+            out.add(word[:-2] + "a")           # amiche → amica
+    return out
+
+
+def noun_root(key: str) -> str:
+    """'il gatto' → 'gatto', "l'acqua" → 'acqua', 'il tempo (clima)' → 'tempo'."""
+    key = fold_apostrophes(re.sub(r"\([^)]*\)", " ", key)).lower().strip()
+    m = re.match(r"(il|lo|la|i|gli|le|l'|un|uno|una|un')\s*(.+)", key)
+    if m and (m.group(1).endswith("'") or key[len(m.group(1))] == " "):
+        key = m.group(2)
+    return " ".join(key.split())
@@ -0,0 +1,156 @@
+import gzip
+import json
+import lzma
+import os
+import re
+
+try:
+    import zstandard                       # optional: pip install zstandard
+except ImportError:
+    zstandard = None
+
+# Lecture and progress files may be stored as x.json, x.json.gz, x.json.xz or
+# x.json.zst. Reading detects the format from the magic bytes, writing picks
+# it from the extension. Top-level objects are decoded one member at a time
+# from the decompressing stream, so no complete uncompressed copy of the file
+# is ever held in memory.
+
+SUFFIXES = {".gz": "gz", ".xz": "xz", ".lzma": "xz", ".zst": "zst"}
+MAGIC = ((b"\x1f\x8b", "gz"), (b"\xfd7zXZ\x00", "xz"), (b"\x28\xb5\x2f\xfd", "zst"))
+# compression for newly created progress files, e.g. TRAINER_COMPRESS=gz
+NEW_SUFFIX = {"gz": ".gz", "xz": ".xz", "zst": ".zst"}.get(os.environ.get("TRAINER_COMPRESS", ""), "")
+
+
+def codec_of_name(path):
+    return SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def sniff(path):
+    """Compression of an existing file from its first bytes (None = plain)."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    return next((c for magic, c in MAGIC if head.startswith(magic)), None)
+
+
+def is_json(name):
+    """x.json, optionally compressed."""
+    if codec_of_name(name):
+        name = os.path.splitext(name)[0]
+    return name.endswith(".json")
+
+
+def json_stem(name):
+    """'nouns_lecture_1.json.gz' → 'nouns_lecture_1'."""
+    if codec_of_name(name):
+        name = os.path.splitext(name)[0]
+    return os.path.splitext(name)[0]
+
+
+def resolve(path, new_suffix=NEW_SUFFIX):
+    """The existing compressed or plain variant of `path`, else the name a new file gets."""
+    for suffix in ("", ".gz", ".xz", ".zst"):
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return path + new_suffix
+
+
+def open_text(path, mode="r", codec=None):
+    """UTF-8 text stream, decompressing on read and compressing on write."""
+    if codec is None:
+        codec = sniff(path) if "r" in mode else codec_of_name(path)
+    mode = mode.replace("t", "") + "t"
+    if codec == "gz":
+        return gzip.open(path, mode, encoding="utf-8")
+    if codec == "xz":
+        return lzma.open(path, mode, encoding="utf-8")
+    if codec == "zst":
+        if zstandard is None:
+            raise ValueError(f"{path}: zstd-compressed, but the 'zstandard' package is not installed")
+        return zstandard.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ── streaming object decoding ────────────────────────────
+_WS = re.compile(r"[ \t\n\r]*")
+_NUM_END = re.compile(r"[,}\]\s]")
+_plain = json.JSONDecoder()
+
+
+class _Stream:
+    def __init__(self, f, chunk):
+        self.f, self.chunk = f, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def fill(self):
+        data = self.f.read(self.chunk)
+        self.eof = not data
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r}, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self, decoder):
+        while True:
+            if self.peek() in "-0123456789":
+                # "1.5e10" split after "1." still decodes as a number
+                while not self.eof and not _NUM_END.search(self.buf, self.pos):
+                    self.fill()
+            try:
+                val, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()                  # value continues in the next chunk
+                continue
+            if end == len(self.buf) and not self.eof:
+                self.fill()                  # a number might go on
+                continue
+            self.pos = end
+            return val
+
+
+def iter_object(f, decoder=None, chunk=1 << 16):
+    """(key, value) pairs of the top-level JSON object in text stream `f`."""
+    s = _Stream(f, chunk)
+    decoder = decoder or _plain
+    if s.peek() != "{":
+        raise ValueError("top level must be an object")
+    s.pos += 1
+    if s.peek() == "}":
+        return
+    while True:
+        key = s.value(_plain)
+        if not isinstance(key, str):
+            raise ValueError(f"object key must be a string, found {key!r}")
+        s.expect(":")
+        yield key, s.value(decoder)
+        ch = s.peek()
+        s.pos += 1
+        if ch == "}":
+            return
+        if ch != ",":
+            raise ValueError(f"expected ',' or '}}', found {ch!r}")
+
+
+def load_json(path):
+    """A JSON object file (plain or compressed) as a dict, decoded member by member."""
+    with open_text(path) as f:
+        return dict(iter_object(f))
+
+
+def dump_json(obj, path, **kw):
+    """Write `obj` atomically, compressed according to the extension of `path`."""
+    tmp = path + ".tmp"
+    with open_text(tmp, "w", codec=codec_of_name(path)) as f:
+        json.dump(obj, f, **kw)
+    os.replace(tmp, path)
@@ -0,0 +1,31 @@
+import os
+
+# New and failed cards go through short steps (minutes) before they are
+# scheduled in days again. While a card is in a step its record has a
+# "step" field; "interval" stays in days and is what it graduates with.
+LEARNING_STEPS = tuple(int(m) for m in os.environ.get("TRAINER_LEARNING_STEPS", "1,10").split(",")
+                       if m.strip())
+
+
+def learn(rec, correct, now, steps=LEARNING_STEPS):
+    """Move a new or (re)learning card along the steps.
+
+    Returns True while it is still learning (its due time is then set, in
+    minutes), False once it graduates and is to be scheduled in days.
+    """
+    step = rec.get("step", 0) + 1 if correct else 0
+    if step >= len(steps):
+        rec.pop("step", None)
+        return False
+    rec["step"] = step
+    rec["due"] = now + steps[step] * 60
+    return True
+
+
+def relearn(rec, now, steps=LEARNING_STEPS):
+    """Put a failed review card back to the first step; False if there are no steps."""
+    if not steps:
+        return False
+    rec["step"] = 0
+    rec["due"] = now + steps[0] * 60
+    return True
@@ -0,0 +1,69 @@
+import os
+import tkinter as tk
+
+# A lapse is a miss on a card that had been answered before. A card becomes a
+# leech at LEECH_LAPSES lapses and again every half of that after; a leech is
+# suspended (taken out of every due index) or only tagged, per LEECH_ACTION.
+LEECH_LAPSES = int(os.environ.get("TRAINER_LEECH_LAPSES", "8"))
+LEECH_ACTION = os.environ.get("TRAINER_LEECH_ACTION", "suspend")     # or "tag"
+
+
+def lapse(rec, threshold=LEECH_LAPSES, action=LEECH_ACTION):
+    """Count a lapse on `rec`; returns True when it just became a leech."""
+    n = rec["lapses"] = rec.get("lapses", 0) + 1
+    if n < threshold or (n - threshold) % max(1, threshold // 2):
+        return False
+    rec["leech"] = True
+    if action == "suspend":
+        rec["suspended"] = True
+    return True
+
+
+def is_suspended(rec):
+    return bool(rec and rec.get("suspended"))
+
+
+def release(rec, reset=False):
+    """Unsuspend a leech; `reset` also restarts it as a fresh card."""
+    rec.pop("suspended", None)
+    rec.pop("leech", None)
+    if reset:
+        rec.update(interval=1, ease=2.5, lapses=0)
+
+
+# ── leech review screen ──────────────────────────────────
+def leech_window(root, srs, on_change=None):
+    """List the leeches of `srs` with buttons to unsuspend or reset them."""
+    win = tk.Toplevel(root)
+    win.title("Leeches")
+    tk.Label(win, text=f"Cards with {LEECH_LAPSES}+ lapses "
+                       f"({'suspended' if LEECH_ACTION == 'suspend' else 'tagged'})").pack(pady=4)
+    lst = tk.Listbox(win, width=50, height=15, selectmode=tk.EXTENDED)
+    lst.pack(padx=8, pady=4)
+    keys = []
+
+    def fill():
+        keys[:] = sorted(srs.leeches(), key=lambda k: -srs.progress[k].get("lapses", 0))
+        lst.delete(0, tk.END)
+        for k in keys:
+            rec = srs.progress[k]
+            flag = "  ⏸ suspended" if is_suspended(rec) else ""
+            lst.insert(tk.END, f"{k} — {rec.get('lapses', 0)} lapses, ease {rec['ease']:.2f}{flag}")
+        if not keys:
+            lst.insert(tk.END, "No leeches 🎉")
+
+    def act(reset):
+        for i in lst.curselection():
+            if i < len(keys):
+                srs.release(keys[i], reset)
+        fill()
+        if on_change:
+            on_change()
+
+    btns = tk.Frame(win)
+    btns.pack(pady=4)
+    tk.Button(btns, text="Unsuspend", command=lambda: act(False)).pack(side="left", padx=3)
+    tk.Button(btns, text="Reset & unsuspend", command=lambda: act(True)).pack(side="left", padx=3)
+    tk.Button(btns, text="Close", command=win.destroy).pack(side="left", padx=3)
+    fill()
+    return win
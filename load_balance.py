@@ -0,0 +1,62 @@
+from collections import Counter
+
+from clock import local_day
+from leeches import is_suspended
+
+
+def fuzz_range(interval):
+    """Days a review interval may move either way."""
+    if interval < 3:
+        return 0
+    if interval < 7:
+        return 1
+    if interval <= 30:
+        return max(2, round(interval * 0.15))
+    return max(4, round(interval * 0.05))
+
+
+# ── per-day due histogram ────────────────────────────────
+class DueHistogram:
+    """Review cards due per day, kept up to date on every answer.
+
+    `pick` spreads the cards learned together over the fuzz window, so they
+    do not all come due on the same day. Learning and suspended cards are
+    not counted.
+    """
+
+    def __init__(self, records=()):
+        self.days = Counter()
+        for rec in records:
+            self.add(rec)
+
+    @staticmethod
+    def _day(rec):
+        if rec is None or "step" in rec or is_suspended(rec):
+            return None
+        return local_day(rec["due"])       # same day boundary as planner and bury list
+
+    def add(self, rec):
+        d = self._day(rec)
+        if d is not None:
+            self.days[d] += 1
+
+    def remove(self, rec):
+        d = self._day(rec)
+        if d is not None:
+            self.days[d] -= 1
+            if self.days[d] <= 0:
+                del self.days[d]
+
+    def pick(self, now, interval):
+        """Interval within the fuzz window whose due day has the fewest reviews."""
+        delta = fuzz_range(interval)
+        if not delta:
+            return interval
+        today = local_day(now)
+        return min(range(interval - delta, interval + delta + 1),
+                   key=lambda i: (self.days.get(today + i, 0), abs(i - interval), i))
+
+    def forecast(self, now, days=7):
+        """Reviews due on each of the next `days` days (today first)."""
+        today = local_day(now)
+        return [self.days.get(today + i, 0) for i in range(days)]
@@ -0,0 +1,90 @@
+import unicodedata
+from functools import lru_cache
+
+CORRECT, ALMOST, WRONG = "correct", "almost", "wrong"
+
+
+# ── normalisation ────────────────────────────────────────
+def norm(txt: str) -> str:
+    return " ".join(txt.lower().replace("’", "'").split())
+
+
+@lru_cache(maxsize=4096)
+def fold(txt: str) -> str:
+    """norm() plus accent folding: 'Città' → 'citta'."""
+    decomposed = unicodedata.normalize("NFD", norm(txt))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def typo_budget(word: str) -> int:
+    """Edits tolerated for an answer of this length.
+
+    Short words get none: one edit turns Tisch into Fisch or Maus into Haus.
+    """
+    n = len(word)
+    return 0 if n < 5 else 1 if n < 10 else 2
+
+
+# ── bounded Damerau-Levenshtein ──────────────────────────
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance, or limit + 1 once it exceeds `limit`.
+
+    Only the diagonal band of width 2*limit+1 is computed and the scan stops
+    as soon as a whole row is over the limit.
+    """
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
+        return limit + 1
+    big = limit + 1
+    prev2 = None
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        cur = [big] * (lb + 1)
+        cur[0] = i
+        lo, hi = max(1, i - limit), min(lb, i + limit)
+        row_min = cur[0] if lo == 1 else big
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            cb = b[j - 1]
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                d = min(d, prev2[j - 2] + 1)
+            cur[j] = d
+            if d < row_min:
+                row_min = d
+        if row_min > limit:
+            return big
+        prev2, prev = prev, cur
+    return min(prev[lb], big)
+
+
+# ── grading ──────────────────────────────────────────────
+def grade(answer: str, accepted, fuzzy: bool = True, taken=None):
+    """Grade `answer` against all accepted variants.
+
+    Returns (CORRECT | ALMOST | WRONG, closest variant). An answer that only
+    differs in accents, or within `typo_budget` edits, is ALMOST – unless
+    `taken(answer)` is true: it is the answer to another card, so WRONG.
+    """
+    ans = norm(answer)
+    accepted = [norm(a) for a in accepted]
+    if ans in accepted:
+        return CORRECT, ans
+    if not fuzzy or not ans or (taken and taken(ans)):
+        return WRONG, accepted[0] if accepted else ""
+    f_ans = fold(ans)
+    best, best_d = None, None
+    for a in accepted:
+        f_a = fold(a)
+        if f_ans == f_a:
+            return ALMOST, a
+        limit = typo_budget(f_a)
+        if limit:
+            d = edit_distance(f_ans, f_a, limit)
+            if d <= limit and (best_d is None or d < best_d):
+                best, best_d = a, d
+    if best is not None:
+        return ALMOST, best
+    return WRONG, accepted[0] if accepted else ""
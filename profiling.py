@@ -0,0 +1,181 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import tkinter as tk
+import tkinter.filedialog as filedialog
+import tkinter.messagebox as messagebox
+import tracemalloc
+
+from clock import VirtualClock
+
+# read-only inputs a scratch session shares with the real data directory;
+# everything else (progress shards, buried.json, confusions.json, …) starts empty
+SHARED_INPUTS = ("lectures", "corpus.json", "corpus.bin", "examples_index.json", "audio_cache")
+
+
+# ── scratch data directory ───────────────────────────────
+def scratch_session(directory=None, clock_start=None, seed="0"):
+    """Run the rest of the process in a fresh data directory with a pinned clock.
+
+    Replays and profiles then start from the same state every time: no
+    learner progress, a VirtualClock at `clock_start` and a fixed seed
+    (unless TRAINER_CLOCK_START / TRAINER_SEED are already set). Returns
+    the directory, which is left in place for inspection.
+    """
+    src = os.getcwd()
+    if directory:
+        if os.path.isdir(directory) and os.listdir(directory):
+            raise SystemExit(f"scratch directory {directory} is not empty")
+        os.makedirs(directory, exist_ok=True)
+    else:
+        directory = tempfile.mkdtemp(prefix="trainer-scratch-")
+    for name in SHARED_INPUTS:
+        path = os.path.join(src, name)
+        if not os.path.exists(path):
+            continue
+        try:
+            os.symlink(path, os.path.join(directory, name), target_is_directory=os.path.isdir(path))
+        except OSError:                   # no symlinks (Windows without privilege)
+            (shutil.copytree if os.path.isdir(path) else shutil.copy2)(path, os.path.join(directory, name))
+    os.environ.setdefault("TRAINER_CLOCK_START", str(clock_start or VirtualClock().now))
+    os.environ.setdefault("TRAINER_SEED", seed)
+    os.chdir(directory)
+    print(f"scratch data directory: {directory}", file=sys.stderr)
+    return directory
+
+
+# ── scripted replay of a GUI session ─────────────────────
+class Replay:
+    """Feeds a list of steps into whatever Tk window is currently open.
+
+    A script is a JSON list; every step may carry `"wait"` (ms, default 200)
+    and one action:
+        {"click": "Next"}             invoke a Button/Checkbutton by its text
+        {"type": "der Tag"}           replace the text of the Entry
+        {"key": "<Return>"}           send a key event to the Entry
+        {"select": "Plural form"}     pick an OptionMenu entry by label
+        {"quit": true}                close the window (ends the session)
+    The trainers open a fresh `tk.Tk()` per screen, so `install()` hooks
+    `Tk.mainloop` to carry the script over to each new window. Modal dialogs
+    are replaced by no-ops so a run never blocks.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.pos = 0
+        self.log = []
+        self._armed = None            # root that has the next step scheduled
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def install(self):
+        orig_mainloop = tk.Tk.mainloop
+        replay = self
+
+        def mainloop(root, n=0):
+            replay._schedule(root)
+            orig_mainloop(root, n)
+
+        tk.Tk.mainloop = mainloop
+        for name in ("showinfo", "showwarning", "showerror"):
+            setattr(messagebox, name, lambda title=None, message=None, **kw: self.log.append((title, message)))
+        filedialog.askopenfilename = lambda **kw: ""
+
+    def _schedule(self, root):
+        if self.pos < len(self.steps) and self._armed is not root:
+            self._armed = root
+            root.after(self.steps[self.pos].get("wait", 200), self._run, root)
+
+    @staticmethod
+    def _widgets(root):
+        todo = [root]
+        while todo:
+            w = todo.pop()
+            yield w
+            todo.extend(w.winfo_children())
+
+    def _find(self, root, kinds, text=None):
+        for w in self._widgets(root):
+            if isinstance(w, kinds) and (text is None or w.cget("text") == text):
+                return w
+        raise LookupError(f"replay step {self.pos}: no {kinds} {text!r}")
+
+    def _select(self, root, label):
+        for w in self._widgets(root):
+            if isinstance(w, tk.OptionMenu):
+                menu = w.nametowidget(w.cget("menu"))
+                for i in range((menu.index("end") or 0) + 1):
+                    if menu.entrycget(i, "label") == label:
+                        menu.invoke(i)
+                        return
+        raise LookupError(f"replay step {self.pos}: no menu entry {label!r}")
+
+    def _run(self, root):
+        self._armed = None
+        step = self.steps[self.pos]
+        self.pos += 1
+        if "click" in step:
+            self._find(root, (tk.Button, tk.Checkbutton), step["click"]).invoke()
+        elif "type" in step:
+            e = self._find(root, tk.Entry)
+            e.delete(0, tk.END)
+            e.insert(0, step["type"])
+        elif "key" in step:
+            e = self._find(root, tk.Entry)
+            e.focus_force()
+            e.event_generate(step["key"], when="now")
+        elif "select" in step:
+            self._select(root, step["select"])
+        elif step.get("quit"):
+            root.destroy()
+            return
+        # the action may have replaced the window (and already handed the
+        # script on to the new one); otherwise keep going here
+        try:
+            alive = root.winfo_exists()
+        except tk.TclError:
+            alive = False
+        if alive:
+            self._schedule(root)
+        elif self.pos >= len(self.steps) and tk._default_root is not None:
+            tk._default_root.destroy()
+
+
+# ── profiling ────────────────────────────────────────────
+def run_profiled(fn, out_dir, top=30):
+    """Run `fn` under cProfile and tracemalloc, writing the results to out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    tracemalloc.start(25)
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        fn()
+    finally:
+        prof.disable()
+        snap = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        prof.dump_stats(os.path.join(out_dir, "session.pstats"))
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        with open(os.path.join(out_dir, "profile.txt"), "w", encoding="utf-8") as f:
+            f.write(buf.getvalue())
+
+        snap = snap.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+        ))
+        snap.dump(os.path.join(out_dir, "session.tracemalloc"))
+        with open(os.path.join(out_dir, "allocations.txt"), "w", encoding="utf-8") as f:
+            f.write(f"peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            for stat in snap.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
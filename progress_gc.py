@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from corpus import LECTURE_ROOT, check_file, lecture_paths, load_corpus, norm_key
+from jsonio import codec_of_name, dump_json, is_json, json_stem, load_json, open_text, resolve
+from siblings import base_key
+
+PROGRESS_ROOT = "progress"                # per-lecture shards of the noun trainer
+LEGACY_FILES = ("srs_progress.json", "srs_nouns_it2de.json", "srs_nouns_de2it.json")
+QUARANTINE_DIR = "progress_orphans"
+STATE_FILE = "progress_gc.json"
+
+# A progress record is an orphan when its key is no card of any lecture: old
+# German keys written by the reverse mode of app_v006, or words that have
+# since been removed from the lectures. Orphans are moved to QUARANTINE_DIR
+# (or deleted) and the progress file is rewritten without them. STATE_FILE
+# remembers which files were clean against which corpus, so later passes
+# only look at files that changed since.
+
+
+def gc_key(key: str) -> str:
+    """Comparable form of lecture and progress keys (both SRS spellings)."""
+    return norm_key(base_key(key)).lower()     # 'il gatto::plural' → 'il gatto'
+
+
+def lecture_keys(root=LECTURE_ROOT):
+    """Lecture name ('nouns/x.json') → set of comparable card keys."""
+    corpus = load_corpus(root=root)
+    if corpus:
+        return {name: {gc_key(k) for k in corpus.lecture(name)} for name in corpus.names()}
+    out = {}
+    for path in lecture_paths(root):
+        name, entries, _, _ = check_file(path, root)
+        out[name] = {gc_key(k) for k, _, _ in entries}
+    return out
+
+
+def progress_files(root=PROGRESS_ROOT, legacy=LEGACY_FILES):
+    out = [p for p in map(resolve, legacy) if os.path.exists(p)]
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        out.extend(os.path.join(dirpath, f) for f in sorted(filenames) if is_json(f))
+    return out
+
+
+def _signature(lectures):
+    h = hashlib.blake2b(digest_size=8)
+    for name in sorted(lectures):
+        h.update(json.dumps([name, sorted(lectures[name])], ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+# ── collection ───────────────────────────────────────────
+class ProgressGC:
+    """Removes orphaned records from progress files, one file per `step`."""
+
+    def __init__(self, paths=None, lectures=None, delete=False, dry_run=False,
+                 quarantine=QUARANTINE_DIR, state_file=STATE_FILE, full=False):
+        self.lectures = lecture_keys() if lectures is None else lectures
+        self.known = set().union(*self.lectures.values())
+        self.paths = list(progress_files() if paths is None else paths)
+        self.delete = delete
+        self.dry_run = dry_run
+        self.quarantine = quarantine
+        self.state_file = state_file
+        self._by_stem = {json_stem(n.split("/", 1)[1]): k for n, k in self.lectures.items()
+                         if n.startswith("nouns/")}
+        self.sig = _signature(self.lectures)
+        self.state = {} if full else self._load_state()
+        self.report = []                  # (path, records, orphan keys)
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+
+    def known_for(self, path):
+        """Shards only keep the cards of their own lecture; other files any card."""
+        rel = os.path.relpath(path, PROGRESS_ROOT).replace(os.sep, "/")
+        parts = rel.split("/")
+        if rel.startswith("..") or len(parts) != 2 or json_stem(parts[1]) == "_other":
+            return self.known
+        return self._by_stem.get(json_stem(parts[1]), set())
+
+    def step(self):
+        """Collect the next file; returns False when every file is done."""
+        if not self.paths:
+            self._save_state()
+            return False
+        path = self.paths.pop(0)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return True
+        stamp = [st.st_mtime_ns, st.st_size, self.sig]
+        if self.state.get(path) == stamp:
+            return True                   # unchanged since the last clean pass
+        progress = load_json(path)
+        known = self.known_for(path)
+        orphans = {k: v for k, v in progress.items() if gc_key(k) not in known}
+        self.report.append((path, len(progress), sorted(orphans)))
+        if orphans and self.dry_run:
+            return True                   # only reported; looked at again next pass
+        if orphans:
+            if not self.delete:
+                self._quarantine(path, orphans)
+            kept = {k: v for k, v in progress.items() if k not in orphans}
+            tmp = path + ".gc"
+            with open_text(tmp, "w", codec=codec_of_name(path)) as f:
+                json.dump(kept, f)
+            cur = os.stat(path)
+            if (cur.st_mtime_ns, cur.st_size) != (st.st_mtime_ns, st.st_size):
+                os.unlink(tmp)            # a trainer saved meanwhile; next pass
+                return True
+            os.replace(tmp, path)
+            st = os.stat(path)
+            stamp = [st.st_mtime_ns, st.st_size, self.sig]
+        self.state[path] = stamp
+        return True
+
+    def _quarantine(self, path, orphans):
+        out = os.path.join(self.quarantine, os.path.normpath(os.path.relpath(path)))
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        old = {}
+        if os.path.exists(out):
+            old = load_json(out)
+        old.update(orphans)
+        dump_json(old, out, ensure_ascii=False, indent=1)
+
+    def run(self):
+        while self.step():
+            pass
+        return self.report
+
+
+def report_in_background(out=sys.stderr, **kw):
+    """Count orphans on a daemon thread without changing any progress file.
+
+    Words loaded from outside lectures/ look orphaned too, so nothing is moved
+    at launch; `tools.py gc-progress` quarantines them on request.
+    """
+    def work():
+        try:
+            report = ProgressGC(dry_run=True, **kw).run()
+        except (OSError, ValueError):
+            return                        # best effort; `tools.py gc-progress` reports
+        n = sum(len(orphans) for _, _, orphans in report)
+        if n:
+            print(f"{n} progress record(s) match no lecture card; "
+                  "see `python tools.py gc-progress --dry-run`", file=out)
+    t = threading.Thread(target=work, name="progress-gc", daemon=True)
+    t.start()
+    return t
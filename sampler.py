@@ -0,0 +1,147 @@
+import heapq
+import random
+import time
+
+DAY = 86_400
+MAX_OVERDUE_DAYS = 30      # cap, so one long-neglected card does not swamp the rest
+NEW_WEIGHT = 1.0           # never-seen cards (due 0): like a card due just now
+
+
+# ── weighted due-card sampler ────────────────────────────
+class DueSampler:
+    """Fenwick tree over per-card overdue weights.
+
+    Cards are addressed by a compact integer id (their position in `keys`).
+    A card's weight is 0 while it is not due and 1 + days overdue once it is,
+    so `sample()` is an O(log N) weighted pick and `set_due()` an O(log N)
+    update after each answer – no per-question list building. Never-seen
+    cards (due 0) weigh `new_weight` and are not in the overdue order.
+    """
+
+    def __init__(self, keys, due_of, clock=time.time, rng=random, new_weight=NEW_WEIGHT):
+        self.clock = clock
+        self.rng = rng
+        self.new_weight = new_weight
+        now = clock()
+        self.keys = list(keys)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        n = len(self.keys)
+        self._due = [due_of(k) for k in self.keys]
+        self._weight = [0.0] * n
+        self._tree = [0.0] * (n + 1)
+        self._pending = []         # (due, id) of cards not yet due
+        self._active = []          # (due, id) of due cards, oldest first
+        for i, due in enumerate(self._due):
+            if due <= now:
+                self._weight[i] = self._weight_for(due, now)
+                if due:
+                    self._active.append((due, i))
+            else:
+                self._pending.append((due, i))
+        heapq.heapify(self._pending)
+        heapq.heapify(self._active)
+        # O(N) Fenwick build
+        for i, w in enumerate(self._weight, 1):
+            self._tree[i] += w
+            j = i + (i & -i)
+            if j <= n:
+                self._tree[j] += self._tree[i]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _weight_for(self, due, now):
+        if not due:
+            return self.new_weight
+        return 1.0 + min(MAX_OVERDUE_DAYS, (now - due) / DAY)
+
+    def _add(self, i, delta):
+        i += 1
+        n = len(self.keys)
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _set_weight(self, i, w):
+        if w != self._weight[i]:
+            self._add(i, w - self._weight[i])
+            self._weight[i] = w
+
+    def total(self):
+        s, i = 0.0, len(self.keys)
+        while i > 0:
+            s += self._tree[i]
+            i -= i & -i
+        return s
+
+    def refresh(self, now=None):
+        """Activate cards whose due time has passed since the last call."""
+        now = self.clock() if now is None else now
+        while self._pending and self._pending[0][0] <= now:
+            due, i = heapq.heappop(self._pending)
+            if due != self._due[i]:
+                continue                       # stale entry
+            self._set_weight(i, self._weight_for(due, now))
+            heapq.heappush(self._active, (due, i))
+
+    def set_due(self, key, due, now=None):
+        now = self.clock() if now is None else now
+        i = self.index.get(key)
+        if i is None:
+            return
+        self._due[i] = due
+        if due <= now:
+            self._set_weight(i, self._weight_for(due, now))
+            if due:
+                heapq.heappush(self._active, (due, i))
+        else:
+            self._set_weight(i, 0.0)
+            heapq.heappush(self._pending, (due, i))
+
+    def is_due(self, key):
+        i = self.index.get(key)
+        return i is not None and self._weight[i] > 0
+
+    def sample(self, now=None):
+        """Weighted pick among due cards, or None if nothing is due."""
+        self.refresh(now)
+        total = self.total()
+        if total <= 0:
+            return None
+        target = self.rng.random() * total
+        pos, n = 0, len(self.keys)
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        # float drift can land one past the last positive weight
+        pos = min(pos, n - 1)
+        while pos > 0 and self._weight[pos] <= 0:
+            pos -= 1
+        return self.keys[pos] if self._weight[pos] > 0 else None
+
+    def _clean_active(self):
+        while self._active:
+            due, i = self._active[0]
+            if due == self._due[i] and self._weight[i] > 0:
+                return
+            heapq.heappop(self._active)
+
+    def most_overdue(self, now=None, exclude=None):
+        """Due card with the oldest due time other than `exclude`, or None.
+
+        Never-seen cards are not overdue.
+        """
+        self.refresh(now)
+        self._clean_active()
+        held = []
+        while self._active and self.keys[self._active[0][1]] == exclude:
+            held.append(heapq.heappop(self._active))    # the card on screen
+            self._clean_active()
+        top = self.keys[self._active[0][1]] if self._active else None
+        for entry in held:
+            heapq.heappush(self._active, entry)
+        return top
@@ -0,0 +1,206 @@
+import heapq
+import time
+from collections import deque
+from itertools import islice
+
+from clock import local_day
+
+
+# ── new cards per day ────────────────────────────────────
+class DailyCount:
+    """New cards introduced today; outlives the planners a trainer rebuilds."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.day, self.n = local_day(clock()), 0
+
+    def _roll(self):
+        today = local_day(self.clock())
+        if today != self.day:
+            self.day, self.n = today, 0
+
+    def value(self):
+        self._roll()
+        return self.n
+
+    def add(self):
+        self._roll()
+        self.n += 1
+
+
+# ── session planner ──────────────────────────────────────
+class SessionPlanner:
+    """New, learning and review queues, each with its own index.
+
+    `record_of(key)` returns the SRS record of a card (or None for a new card),
+    `lecture_of` maps card → lecture name and is used to interleave lectures,
+    cards for which `skip(key)` is true (buried siblings, suspended leeches)
+    are left out. The deck is scanned once, when the planner is built (and
+    again at the start of a new day); after that `answered()` files the card
+    into its queue in O(log N) and `pop()` serves, in this order:
+
+      1. learning cards whose minute step is due,
+         then cards asked for with `soon()` (confusable partners),
+      2. due reviews, with one new card after every `reviews_per_new`,
+      3. new cards up to `new_limit` per day,
+      4. the next learning card up to `learn_ahead` seconds early.
+
+    `exclude` (the card on screen) is only served when nothing else is left.
+    Pass the trainer's `new_today` count so that rebuilding the planner (mode,
+    direction, lecture changes) does not reset the daily new-card limit.
+    """
+
+    def __init__(self, keys, record_of, lecture_of=None, new_limit=20, reviews_per_new=4,
+                 clock=time.time, skip=None, learn_ahead=20 * 60, new_today=None):
+        self.keys = list(keys)
+        self.record_of = record_of
+        self.lecture_of = lecture_of or {}
+        self.skip = skip
+        self.new_limit = new_limit
+        self.reviews_per_new = reviews_per_new
+        self.clock = clock
+        self.learn_ahead = learn_ahead
+        self.new_today = new_today or DailyCount(clock)
+        self._soon = deque()
+        self.build()
+
+    def _today(self):
+        return local_day(self.clock())      # same day boundary as the bury list
+
+    def build(self):
+        """(Re)build the three queues from the records; O(N)."""
+        self._day = self._today()
+        self._learning = []                  # heap of (due, key)
+        self._review = {}                    # lecture → heap of (due, key)
+        self._new = {}                       # lecture → deque of keys
+        self._since_new = 0
+        for key in self.keys:
+            if self.skip and self.skip(key):
+                continue
+            rec = self.record_of(key)
+            if rec is None:
+                self._new.setdefault(self.lecture_of.get(key, ""), deque()).append(key)
+            else:
+                self._file(key, rec)
+        heapq.heapify(self._learning)
+        for heap in self._review.values():
+            heapq.heapify(heap)
+        self._lectures = deque(sorted(set(self._review) | set(self._new)))
+
+    def _file(self, key, rec, push=list.append):
+        if "step" in rec:
+            push(self._learning, (rec["due"], key))
+        else:
+            push(self._review.setdefault(self.lecture_of.get(key, ""), []), (rec["due"], key))
+
+    # ----- queue heads ----------------------------------
+    def _valid(self, due, key, learning):
+        """Heap entries go stale when a card is answered again; drop those."""
+        if self.skip and self.skip(key):
+            return False
+        rec = self.record_of(key)
+        return rec is not None and rec["due"] == due and ("step" in rec) == learning
+
+    def _head(self, heap, learning, exclude):
+        """Top valid entry of `heap` other than `exclude`, or None (heap is cleaned)."""
+        held = None
+        while heap:
+            due, key = heap[0]
+            if not self._valid(due, key, learning):
+                heapq.heappop(heap)
+            elif key == exclude and held is None:
+                held = heapq.heappop(heap)
+            else:
+                break
+        top = heap[0] if heap else None
+        if held:
+            heapq.heappush(heap, held)
+        return top
+
+    def _take(self, heap, entry):
+        if heap[0] == entry:
+            heapq.heappop(heap)
+        else:                                # `exclude` was pushed back above it
+            heap.remove(entry)
+            heapq.heapify(heap)
+
+    def _next_review(self, now, exclude):
+        for _ in range(len(self._lectures)):
+            lecture = self._lectures[0]
+            self._lectures.rotate(-1)
+            heap = self._review.get(lecture)
+            top = heap and self._head(heap, False, exclude)
+            if top and top[0] <= now:
+                self._take(heap, top)
+                return top[1]
+        return None
+
+    def _next_new(self, exclude):
+        if self.new_today.value() >= self.new_limit:
+            return None
+        for _ in range(len(self._lectures)):
+            lecture = self._lectures[0]
+            self._lectures.rotate(-1)
+            queue = self._new.get(lecture)
+            while queue and (self.record_of(queue[0]) is not None
+                             or (self.skip and self.skip(queue[0]))):
+                queue.popleft()              # seen or buried meanwhile
+            if queue and queue[0] != exclude:
+                return queue.popleft()
+            if queue and len(queue) > 1:
+                key = queue[1]
+                del queue[1]
+                return key
+        return None
+
+    # ----- UI side --------------------------------------
+    def pop(self, exclude=None):
+        """Next card by queue priority, or None if there is nothing at all to do."""
+        now = self.clock()
+        if self._today() != self._day:
+            self.build()                     # buried cards are back
+        top = self._head(self._learning, True, exclude)
+        if top and top[0] <= now:
+            self._take(self._learning, top)
+            return top[1]
+        while self._soon:
+            key = self._soon.popleft()
+            if key != exclude and not (self.skip and self.skip(key)):
+                return key
+        key = None
+        if self._since_new < self.reviews_per_new:
+            key = self._next_review(now, exclude)
+        if key is None:
+            key = self._next_new(exclude)
+            if key is not None:
+                self._since_new = 0
+                return key
+            key = self._next_review(now, exclude)
+        if key is not None:
+            self._since_new += 1
+            return key
+        if top and top[0] <= now + self.learn_ahead:
+            self._take(self._learning, top)
+            return top[1]
+        return self.pop() if exclude is not None else None
+
+    def peek(self, n=3):
+        """Likely next cards without taking them (for prefetching)."""
+        out = [k for _, k in sorted(self._learning[:n])]     # heap prefix, no scan
+        for heap in self._review.values():
+            out.extend(k for _, k in sorted(heap[:n]))
+        for queue in self._new.values():
+            out.extend(islice(queue, n))
+        return out[:n]
+
+    def soon(self, key):
+        """Serve `key` before the reviews, e.g. a card it was just confused with."""
+        if key not in self._soon:
+            self._soon.append(key)
+
+    def answered(self, key, was_new=False):
+        if was_new:
+            self.new_today.add()
+        rec = self.record_of(key)
+        if rec is not None and not (self.skip and self.skip(key)):
+            self._file(key, rec, push=heapq.heappush)
@@ -0,0 +1,99 @@
+import datetime
+import os
+import time
+
+from clock import local_day
+from italian_text import noun_root
+from jsonio import dump_json, load_json
+
+BURY_FILE = "buried.json"
+SEP = "::"
+# exercise mode → suffix of its card key; Translate keeps the plain word so
+# the existing progress stays attached to it
+MODE_SUFFIX = {"Translate": "", "Plural form": SEP + "plural", "Indef. article": SEP + "indef",
+               "Multiple choice": SEP + "choice"}
+
+
+def card_key(word, mode="Translate"):
+    """'il gatto' in Plural mode → 'il gatto::plural'."""
+    return word + MODE_SUFFIX.get(mode, "")
+
+
+def base_key(card):
+    return card.split(SEP, 1)[0]
+
+
+# ── siblings ─────────────────────────────────────────────
+class SiblingIndex:
+    """Card key → lexical entry, precomputed once per lecture selection.
+
+    All cards of one noun are siblings: both directions, every exercise
+    mode, and entries that only differ in spelling or a qualifier
+    ('il tempo' / 'il tempo (clima)', 'l’acqua' / "l'acqua").
+    """
+
+    def __init__(self, keys=()):
+        self.group_of = {k: noun_root(k) for k in keys}
+        self.members = {}
+        for k, g in self.group_of.items():
+            self.members.setdefault(g, []).append(k)
+
+    def group(self, card):
+        word = base_key(card)
+        g = self.group_of.get(word)
+        return g if g is not None else noun_root(word)
+
+    def siblings(self, word):
+        """Other lecture entries of the same lexical entry."""
+        return [k for k in self.members.get(self.group(word), ()) if k != word]
+
+
+# ── bury list ────────────────────────────────────────────
+class BuryList:
+    """Lexical entries reviewed today, with the cards they were reviewed as.
+
+    Once one card of an entry has been answered, its siblings are buried
+    until the next local day. Kept in a small file so the other direction
+    and a restarted session see it too.
+    """
+
+    def __init__(self, path=BURY_FILE, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.day = self._today()
+        self.cards = {}                      # group → card ids reviewed today
+        if path and os.path.exists(path):
+            try:
+                data = load_json(path)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("day") == self.day:
+                self.cards = {g: set(c) for g, c in data["cards"].items()}
+
+    def _today(self):
+        return local_day(self.clock())
+
+    def _roll(self):
+        today = self._today()
+        if today != self.day:
+            self.day, self.cards = today, {}
+
+    def reviewed(self, group, card):
+        self._roll()
+        self.cards.setdefault(group, set()).add(card)
+        if self.path:
+            dump_json({"day": self.day, "cards": {g: sorted(c) for g, c in self.cards.items()}},
+                      self.path, ensure_ascii=False)
+
+    def buried(self, group, card):
+        """True if a sibling of `card` (not the card itself) was reviewed today."""
+        self._roll()
+        seen = self.cards.get(group)
+        return bool(seen) and not seen <= {card}
+
+    def until(self, group, card):
+        """Start of tomorrow while `card` is buried, else 0 (for due times)."""
+        if not self.buried(group, card):
+            return 0
+        tomorrow = datetime.date.fromordinal(self.day + 1)
+        return datetime.datetime.combine(tomorrow, datetime.time()).timestamp()
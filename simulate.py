@@ -0,0 +1,158 @@
+import csv
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from clock import VirtualClock
+from session import DailyCount, SessionPlanner
+
+DAY = 86_400
+EPOCH = 1_750_000_000          # arbitrary fixed start, keeps runs reproducible
+
+# chance to get a brand-new card right, to get a learning step (minutes
+# later) right, recall probability at exactly the scheduled interval, and
+# seconds spent per answer
+PROFILES = {
+    "strong":  {"first": 0.60, "step": 0.90, "retention": 0.95, "seconds": 6},
+    "average": {"first": 0.40, "step": 0.80, "retention": 0.85, "seconds": 8},
+    "weak":    {"first": 0.25, "step": 0.65, "retention": 0.70, "seconds": 11},
+}
+MAX_ANSWERS = 5_000        # per simulated session, a guard against endless relearning
+
+
+# ── one simulated learner ────────────────────────────────
+def _make_srs(variant, clock):
+    if variant == "v006":
+        from app_v006 import SRS
+    else:
+        from trainer_nouns import SRS
+    return SRS(filename=None, clock=clock)
+
+
+def simulate_user(variant, profile, cards, days, new_per_day, max_reviews, seed):
+    """Per-day (reviews, correct, new, backlog, steps) of one learner, plus SRS seconds and ops.
+
+    Each day is one session served by the trainers' SessionPlanner: minute
+    learning steps come due within the session, reviews and up to
+    `new_per_day` new cards are interleaved as in the GUI. `max_reviews`
+    caps the review answers; capped reviews wait for the next day. The
+    backlog is every review that came due during the session, capped or not.
+    """
+    rng = random.Random(seed)
+    p = PROFILES[profile]
+    clock = VirtualClock(EPOCH)
+    srs = _make_srs(variant, clock)
+    keys = [f"card{i:05d}" for i in range(cards)]
+    new_today = DailyCount(clock)
+    last_seen = {}
+    log_ret = math.log(p["retention"])
+    per_day = []
+    sched_time = 0.0
+    ops = 0
+
+    for day in range(days):
+        clock.now = EPOCH + day * DAY + 8 * 3600
+        t0 = time.perf_counter()
+        planner = SessionPlanner(keys, srs.record, new_limit=new_per_day, clock=clock, new_today=new_today)
+        sched_time += time.perf_counter() - t0
+        reviews = correct = introduced = steps = capped = 0
+        for _ in range(MAX_ANSWERS):
+            t0 = time.perf_counter()
+            k = planner.pop()
+            sched_time += time.perf_counter() - t0
+            if k is None:
+                break
+            rec = srs.record(k)
+            if rec is None:
+                ok = rng.random() < p["first"]
+                introduced += 1
+            elif "step" in rec:
+                ok = rng.random() < p["step"]
+                steps += 1
+            elif max_reviews and reviews >= max_reviews:
+                capped += 1
+                continue                       # still due tomorrow
+            else:
+                elapsed = (clock.now - last_seen[k]) / DAY
+                ok = rng.random() < math.exp(log_ret * elapsed / max(1, rec["interval"]))
+                reviews += 1
+                correct += ok
+            t0 = time.perf_counter()
+            srs.update(k, ok)
+            planner.answered(k, rec is None)
+            sched_time += time.perf_counter() - t0
+            last_seen[k] = clock.now
+            clock.advance(p["seconds"])
+            ops += 1
+        ops += 1
+        per_day.append((reviews, correct, introduced, reviews + capped, steps))
+    return per_day, sched_time, ops
+
+
+def _run_batch(args):
+    variant, profiles, cards, days, new_per_day, max_reviews, seeds = args
+    totals = [[0] * 5 for _ in range(days)]
+    sched, ops = 0.0, 0
+    for seed in seeds:
+        profile = profiles[seed % len(profiles)]
+        per_day, t, n = simulate_user(variant, profile, cards, days, new_per_day, max_reviews, seed)
+        sched += t
+        ops += n
+        for tot, row in zip(totals, per_day):
+            for i, v in enumerate(row):
+                tot[i] += v
+    return totals, sched, ops
+
+
+# ── many learners ────────────────────────────────────────
+def simulate(users=100, days=90, cards=500, new_per_day=20, max_reviews=None,
+             profiles=("average",), variant="nouns", jobs=None, seed=0):
+    """Simulate `users` learners in a process pool; returns (rows, summary)."""
+    jobs = jobs or os.cpu_count() or 1
+    seeds = list(range(seed, seed + users))
+    batch = max(1, math.ceil(users / (jobs * 4)))
+    tasks = [(variant, tuple(profiles), cards, days, new_per_day, max_reviews, seeds[i:i + batch])
+             for i in range(0, users, batch)]
+
+    totals = [[0] * 5 for _ in range(days)]
+    sched, ops = 0.0, 0
+    wall = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part, t, n in pool.map(_run_batch, tasks):
+            sched += t
+            ops += n
+            for tot, row in zip(totals, part):
+                for i, v in enumerate(row):
+                    tot[i] += v
+    wall = time.perf_counter() - wall
+
+    rows = []
+    for day, (reviews, correct, introduced, backlog, steps) in enumerate(totals):
+        rows.append({
+            "day": day,
+            "reviews_per_user": round(reviews / users, 2),
+            "new_per_user": round(introduced / users, 2),
+            "steps_per_user": round(steps / users, 2),
+            "backlog_per_user": round(backlog / users, 2),
+            "retention": round(correct / reviews, 4) if reviews else "",
+        })
+    answered = sum(r[0] + r[2] + r[4] for r in totals)
+    summary = {
+        "users": users,
+        "days": days,
+        "answers": answered,
+        "wall_seconds": round(wall, 2),
+        "answers_per_second": round(answered / wall) if wall else 0,
+        "scheduler_ops_per_second": round(ops / sched) if sched else 0,
+        "peak_reviews_per_user": max(r["reviews_per_user"] for r in rows) if rows else 0,
+    }
+    return rows, summary
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
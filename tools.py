@@ -0,0 +1,185 @@
+import argparse
+import sys
+
+
+# ── commands ─────────────────────────────────────────────
+def cmd_compile_lectures(args):
+    from corpus import compile_lectures
+    errors, warnings = compile_lectures(args.root, args.out, args.jobs, write=not args.check,
+                                        binary=None if args.no_binary else args.binary)
+    for w in warnings:
+        print("warning:", w)
+    for e in errors:
+        print("error:", e)
+    print(f"{len(errors)} error(s), {len(warnings)} warning(s)")
+    if errors:
+        return 1
+    if not args.check:
+        print(f"wrote {args.out}" + ("" if args.no_binary else f" and {args.binary}"))
+    return 0
+
+
+def cmd_simulate(args):
+    from simulate import simulate, write_csv
+    rows, summary = simulate(args.users, args.days, args.cards, args.new_per_day, args.max_reviews,
+                             args.profiles.split(","), args.variant, args.jobs, args.seed)
+    write_csv(rows, args.out)
+    for k, v in summary.items():
+        print(f"{k:>26}: {v}")
+    print(f"wrote {args.out}")
+    return 0
+
+
+def cmd_import(args):
+    from bulk_io import read_rows, write_lecture
+    n, n_rec = write_lecture(read_rows(args.src, args.format), args.lecture, args.progress)
+    print(f"wrote {n} entries to {args.lecture}"
+          + (f", {n_rec} SRS records to {args.progress}" if args.progress else ""))
+    return 0
+
+
+def cmd_export(args):
+    from bulk_io import iter_lecture, write_rows
+    from jsonio import load_json
+    progress = load_json(args.progress) if args.progress else None
+    n = write_rows(iter_lecture(args.lecture, progress), args.out, args.format)
+    print(f"wrote {n} rows to {args.out}")
+    return 0
+
+
+def cmd_index_examples(args):
+    from examples import build_index, text_paths
+    paths = text_paths(args.texts)
+    if not paths:
+        print(f"no .txt files under {args.texts}/")
+        return 1
+    n_sent, n_lemma = build_index(paths, args.out)
+    print(f"indexed {n_sent} sentences under {n_lemma} lemmas from {len(paths)} text(s) → {args.out}")
+    return 0
+
+
+def cmd_extract_nouns(args):
+    import os
+    import time
+    from extract_nouns import DRAFT_DIR, extract, write_lecture
+    t0 = time.perf_counter()
+    ranked = extract(args.text, top=args.top, min_count=args.min_count)
+    for key, n in ranked:
+        print(f"{n:>6}  {key}")
+    out = args.out or os.path.join(DRAFT_DIR, f"nouns_{os.path.splitext(os.path.basename(args.text))[0]}.json")
+    n = write_lecture(ranked, out)
+    print(f"wrote {n} new nouns to {out} in {time.perf_counter() - t0:.2f}s "
+          "(fill in the 'de' translations, then move it to lectures/nouns/)")
+    return 0
+
+
+def cmd_gc_progress(args):
+    from progress_gc import ProgressGC
+    gc = ProgressGC(paths=args.files or None, delete=args.delete, dry_run=args.dry_run, full=args.full)
+    total = 0
+    for path, n, orphans in gc.run():
+        total += len(orphans)
+        print(f"{path}: {len(orphans)} of {n} record(s) orphaned")
+        for k in orphans[:args.show]:
+            print("   ", k)
+        if len(orphans) > args.show:
+            print(f"    … {len(orphans) - args.show} more")
+    action = "would remove" if args.dry_run else "deleted" if args.delete else f"moved to {gc.quarantine}/"
+    print(f"{total} orphan(s) {action}")
+    return 0
+
+
+def cmd_class_report(args):
+    from class_report import rows, scan, write_csv, write_html
+    stats, learners, errors, seconds = scan(args.root, args.jobs)
+    for e in errors:
+        print("error:", e)
+    report = rows(stats, args.min_learners)
+    if args.csv:
+        write_csv(report, args.csv)
+    write_html(report, args.html, learners)
+    for r in report[:args.top]:
+        print(f"{r['hard_share']:>6.0%}  ease {r['mean_ease']:.2f}  {r['direction']}  {r['card']}")
+    print(f"{learners} learner(s), {len(report)} card(s) in {seconds:.2f}s → {args.html}"
+          + (f", {args.csv}" if args.csv else ""))
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Maintenance tools for the Italian trainer")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("compile-lectures", help="validate lectures/ and write the compiled corpus")
+    p.add_argument("--root", default="lectures")
+    p.add_argument("--out", default="corpus.json")
+    p.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--binary", default="corpus.bin", help="memory-mapped corpus (default: corpus.bin)")
+    p.add_argument("--no-binary", action="store_true", help="skip the binary corpus")
+    p.add_argument("--check", action="store_true", help="only validate, write nothing")
+    p.set_defaults(func=cmd_compile_lectures)
+
+    formats = ("csv", "tsv", "anki", "sqlite")
+    p = sub.add_parser("import", help="bulk-import CSV/TSV/Anki text/SQLite into a lecture file")
+    p.add_argument("src")
+    p.add_argument("--lecture", required=True, help="lecture JSON to write, e.g. lectures/nouns/x.json")
+    p.add_argument("--progress", help="SRS progress file to merge imported review data into")
+    p.add_argument("--format", choices=formats, help="default: from the file extension")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export lecture files (and progress) to CSV/TSV/Anki text/SQLite")
+    p.add_argument("lecture", nargs="+")
+    p.add_argument("--progress", help="SRS progress file whose records are exported alongside")
+    p.add_argument("--out", required=True)
+    p.add_argument("--format", choices=formats, help="default: from the file extension")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("index-examples", help="build the example-sentence index from source texts")
+    p.add_argument("--texts", default="texts", help="directory of UTF-8 .txt source texts")
+    p.add_argument("--out", default="examples_index.json")
+    p.set_defaults(func=cmd_index_examples)
+
+    p = sub.add_parser("extract-nouns", help="draft a noun lecture from an Italian plain-text document")
+    p.add_argument("text")
+    p.add_argument("--out", help="draft file (default: drafts/nouns_<text>.json)")
+    p.add_argument("--top", type=int, default=50, help="keep the N most frequent new nouns")
+    p.add_argument("--min-count", type=int, default=2)
+    p.set_defaults(func=cmd_extract_nouns)
+
+    p = sub.add_parser("simulate", help="simulate many learners against the SRS with a virtual clock")
+    p.add_argument("--users", type=int, default=100)
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--cards", type=int, default=500, help="deck size per learner")
+    p.add_argument("--new-per-day", type=int, default=20)
+    p.add_argument("--max-reviews", type=int, default=None, help="daily review cap (default: none)")
+    p.add_argument("--profiles", default="strong,average,weak",
+                   help="comma-separated accuracy profiles, assigned round-robin")
+    p.add_argument("--variant", choices=("nouns", "v006"), default="nouns",
+                   help="SRS class to drive: trainer_nouns.py or app_v006.py")
+    p.add_argument("--jobs", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default="simulation.csv")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("gc-progress", help="remove progress records of cards no lecture contains")
+    p.add_argument("files", nargs="*", help="progress files (default: all known ones)")
+    p.add_argument("--dry-run", action="store_true", help="only report the orphans")
+    p.add_argument("--delete", action="store_true", help="delete orphans instead of quarantining them")
+    p.add_argument("--full", action="store_true", help="also re-check files unchanged since the last pass")
+    p.add_argument("--show", type=int, default=10, help="orphan keys listed per file")
+    p.set_defaults(func=cmd_gc_progress)
+
+    p = sub.add_parser("class-report", help="which nouns a whole class struggles with, from learner progress files")
+    p.add_argument("root", help="directory tree with one sub-directory of progress files per learner")
+    p.add_argument("--html", default="class_report.html")
+    p.add_argument("--csv", help="also write the table as CSV")
+    p.add_argument("--min-learners", type=int, default=1, help="skip cards fewer learners have seen")
+    p.add_argument("--top", type=int, default=15, help="cards printed to the terminal")
+    p.add_argument("--jobs", type=int, default=None)
+    p.set_defaults(func=cmd_class_report)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
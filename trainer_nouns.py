@@ -1,47 +1,216 @@
 import tkinter as tk
 import tkinter.messagebox as messagebox
-import random, os, json, time, re
+import os, time, re, math
+from collections import ChainMap
+from sampler import DueSampler
+from session import SessionPlanner, DailyCount
+from history import NavHistory
+from instrument import timed, count, overlay
+from corpus import load_corpus
+from matching import grade, ALMOST, WRONG
+from indexes import ReverseIndex, AnswerIndex, de_list
+from clock import session_clock, session_rng
+from audio import Pronouncer
+from examples import load_examples
+from jsonio import load_json, dump_json, resolve, is_json, json_stem
+from siblings import SiblingIndex, BuryList, card_key, base_key
+from leeches import lapse, is_suspended, release, leech_window
+from learning import learn, relearn
+from load_balance import DueHistogram
+from confusions import ConfusionMatrix
+from distractors import load_table, choices
 
 
 # ── SRS helper ───────────────────────────────────────────
 class SRS:
-    def __init__(self, filename="srs_nouns.json"):
-        self.progress_file = filename
+    """`filename=None` keeps progress in memory only (simulations).
+
+    An existing x.json.gz / .xz / .zst variant of `filename` is used instead
+    of the plain file, and saved back in the same compression.
+    """
+
+    def __init__(self, filename="srs_nouns.json", clock=time.time):
+        self.progress_file = filename and resolve(filename)
+        self.clock = clock
         self.progress = self.load_progress()
+        self.load = DueHistogram(self.progress.values())    # reviews per day
 
     def normalize_key(self, txt: str) -> str:
         return txt.lower().replace("’", "'").strip()
 
     def load_progress(self):
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+        if self.progress_file and os.path.exists(self.progress_file):
+            return load_json(self.progress_file)
         return {}
 
+    @timed("srs.save_progress")
     def save_progress(self):
-        with open(self.progress_file, "w", encoding="utf-8") as f:
-            json.dump(self.progress, f)
+        if not self.progress_file:
+            return
+        dump_json(self.progress, self.progress_file)
+
+    def record(self, word):
+        return self.progress.get(self.normalize_key(word))
+
+    def due(self, word) -> float:
+        """Due time; suspended leeches are never due."""
+        rec = self.progress.get(self.normalize_key(word))
+        if rec is None:
+            return 0
+        return math.inf if is_suspended(rec) else rec["due"]
 
     def get_due_words(self, words):
         words = [self.normalize_key(w) for w in words]
-        now = time.time()
-        return [w for w in words if self.progress.get(w, {"due": 0})["due"] <= now]
+        now = self.clock()
+        return [w for w in words if self.due(w) <= now]
+
+    def suspended(self, word) -> bool:
+        return is_suspended(self.record(word))
+
+    def leeches(self):
+        return [k for k, rec in self.progress.items() if rec.get("leech")]
 
-    def update(self, word, correct: bool):
+    def release(self, word, reset=False):
+        rec = self.progress[self.normalize_key(word)]
+        self.load.remove(rec)                # a tagged (not suspended) leech is counted
+        release(rec, reset)
+        self.load.add(rec)
+        self.save_progress()
+
+    @timed("srs.update")
+    def update(self, word, correct: bool, almost: bool = False):
+        """`almost` (typo / missing accent) grows the interval only slightly.
+
+        New and failed cards first go through the minute learning steps;
+        review intervals are fuzzed towards the least loaded nearby day.
+        """
         word = self.normalize_key(word)
-        now = time.time()
+        now = self.clock()
+        seen = word in self.progress
         rec = self.progress.get(word, {"interval": 1, "due": now, "ease": 2.5})
-        if correct:
+        if seen:                             # a new card is in no day bucket yet
+            self.load.remove(rec)
+        learning = False
+        if not seen or "step" in rec:        # False once it graduates
+            learning = learn(rec, correct, now)
+        elif correct and almost:
+            rec["interval"] = max(rec["interval"] + 1, int(rec["interval"] * 1.2))
+            rec["ease"] = max(1.3, rec["ease"] - 0.15)
+        elif correct:
             rec["interval"] = max(1, int(rec["interval"] * rec["ease"]))
             rec["ease"] = min(3.0, rec["ease"] + 0.1)
         else:
             rec["interval"] = 1
             rec["ease"] = max(1.3, rec["ease"] - 0.2)
-        rec["due"] = now + rec["interval"] * 86_400
+            lapse(rec)                       # may suspend it as a leech
+            learning = relearn(rec, now)
+        if not learning:
+            rec["interval"] = self.load.pick(now, rec["interval"])
+            rec["due"] = now + rec["interval"] * 86_400
+        self.load.add(rec)
         self.progress[word] = rec
         self.save_progress()
 
 
+class ShardedSRS(SRS):
+    """Progress split per lecture and direction: progress/<direction>/<lecture>.json.
+
+    Only the shards of the ticked lectures are in memory: `activate` loads
+    one when its checkbox is ticked, `deactivate` saves and evicts it, and a
+    save only rewrites the shards touched by the last update. A shard that
+    does not exist yet is seeded from the old single-file progress `legacy`.
+    A noun shared by several lectures is kept in each of their shards, as
+    are its Plural / Indef. article cards ('il gatto::plural').
+    """
+
+    def __init__(self, direction, root="progress", legacy=None, clock=time.time):
+        self.dir = os.path.join(root, direction)
+        self.legacy_file = legacy
+        self._legacy = None
+        self.shards = {}                     # lecture → its card keys
+        self._owners = {}                    # card key → lectures holding it
+        self._dirty = set()
+        super().__init__(filename=None, clock=clock)
+
+    def _path(self, lecture):
+        return resolve(os.path.join(self.dir, json_stem(lecture) + ".json"))
+
+    def _legacy_progress(self):
+        if self._legacy is None:
+            self._legacy = {}
+            legacy = self.legacy_file and resolve(self.legacy_file)
+            if legacy and os.path.exists(legacy):
+                self._legacy = load_json(legacy)
+        return self._legacy
+
+    @timed("srs.activate")
+    def activate(self, lecture, keys):
+        if lecture in self.shards:
+            return
+        keys = {self.normalize_key(k) for k in keys}
+        path = self._path(lecture)
+        if os.path.exists(path):
+            data = load_json(path)
+        else:
+            legacy = self._legacy_progress()
+            data = {k: legacy[k] for k in keys if k in legacy}
+            self._dirty.add(lecture)         # write the migrated shard once
+        keys |= {k for k in data if base_key(k) in keys}     # mode cards
+        self.shards[lecture] = keys
+        for k in keys:
+            self._owners.setdefault(k, set()).add(lecture)
+        for k, rec in data.items():
+            cur = self.progress.get(k)
+            if cur is None or rec["due"] > cur["due"]:   # newest review wins
+                self.load.remove(cur)
+                self.load.add(rec)
+                self.progress[k] = rec
+        self.save_progress()
+
+    def deactivate(self, lecture):
+        keys = self.shards.get(lecture)
+        if keys is None:
+            return
+        self.save_progress()
+        del self.shards[lecture]
+        for k in keys:
+            owners = self._owners.get(k, set())
+            owners.discard(lecture)
+            if not owners:
+                self._owners.pop(k, None)
+                self.load.remove(self.progress.pop(k, None))
+
+    def _mark(self, key):
+        """Schedule the shards holding `key` for the next save."""
+        owners = self._owners.get(key) or self._owners.get(base_key(key))
+        if not owners:                       # not from a ticked lecture
+            owners = {"_other.json"}
+        if key not in self._owners:          # first answer of a mode card
+            self._owners[key] = set(owners)
+            for lecture in owners:
+                self.shards.setdefault(lecture, set()).add(key)
+        self._dirty.update(owners)
+
+    def update(self, word, correct: bool, almost: bool = False):
+        self._mark(self.normalize_key(word))
+        super().update(word, correct, almost)
+
+    def release(self, word, reset=False):
+        self._mark(self.normalize_key(word))
+        super().release(word, reset)
+
+    @timed("srs.save_progress")
+    def save_progress(self):
+        if not self._dirty:
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        for lecture in self._dirty:
+            keys = self.shards.get(lecture, ())
+            shard = {k: self.progress[k] for k in keys if k in self.progress}
+            dump_json(shard, self._path(lecture))
+        self._dirty.clear()
+
+
 # ── article / plural helpers ─────────────────────────────
 def norm(txt: str) -> str:
     return txt.lower().replace("’", "'").strip()
@@ -104,18 +273,29 @@ def indef_article(word_with_article: str) -> str:
 # ── file helpers ─────────────────────────────────────────
 def lecture_files():
     p = os.path.join("lectures", "nouns")
-    return [f for f in os.listdir(p) if f.endswith(".json")]
+    return [f for f in os.listdir(p) if is_json(f)]
+
 
+@timed("lecture.load")
+def load_lecture(file_list, origin=None):
+    """Merge the given lecture files; `origin`, if given, is filled with key → file."""
+    corpus = load_corpus()                  # compiled by `tools.py compile-lectures`
+    if corpus:
+        # lazy per-lecture mappings (mmap'd with corpus.bin); later files win
+        parts = [corpus.lecture(f"nouns/{name}") for name in file_list]
+        if origin is not None:
+            for name, part in zip(file_list, parts):
+                origin.update(dict.fromkeys(part, name))
+        return ChainMap(*reversed(parts))
 
-def load_lecture(file_list):
     data = {}
     for name in file_list:
-        with open(os.path.join("lectures", "nouns", name), encoding="utf-8") as f:
-            part = json.load(f)
-        for k, v in part.items():
-            if isinstance(v, dict) and "de" in v:
+        for k, v in load_json(os.path.join("lectures", "nouns", name)).items():
+            if isinstance(v, dict) and v.get("de"):     # drafts have an empty 'de'
                 k_norm = k.replace("’", "'").strip()
                 data[k_norm] = v
+                if origin is not None:
+                    origin[k_norm] = name
     return data
 
 
@@ -126,81 +306,217 @@ def start_noun_trainer(prev):
     root.title("Vokabeltrainer – Substantive")
 
     reverse = False
-    
-    # pick the right SRS file for the current direction
+    clock, rng = session_clock(), session_rng()     # pinned by env for replays
+    speaker = Pronouncer()
+    examples = load_examples()              # built by `tools.py index-examples`
+    all_origin = {}
+    all_nouns = load_lecture(lecture_files(), all_origin)
+    answers = AnswerIndex(all_nouns)         # whole corpus, for confusions
+    distractor_table = None                  # loaded on the first multiple-choice card
+    mc_right = None
+    confusions = ConfusionMatrix()
+
+    selected, nouns, origin = [], {}, {}
+
+    # per-lecture progress shards for the current direction; only the
+    # ticked lectures are loaded (the old single files seed new shards)
     def make_srs():
-        filename = "srs_nouns_de2it.json" if reverse else "srs_nouns_it2de.json"
-        return SRS(filename)
+        direction = "de2it" if reverse else "it2de"
+        s = ShardedSRS(direction, legacy=f"srs_nouns_{direction}.json", clock=clock)
+        for name in selected:
+            s.activate(name, load_lecture([name]).keys())
+        return s
 
     srs = make_srs()
 
-    selected, nouns = [], {}
+    rev_idx = ReverseIndex({})
+    sampler = planner = None
     reverse = False
-    current, history, idx = None, [], -1
-    stats = {"correct": 0, "wrong": 0}
+    current, history = None, NavHistory()
+    stats = {"correct": 0, "almost": 0, "wrong": 0}
+    # every mode and direction of a noun is its own card; once one has been
+    # answered today its siblings are deferred to tomorrow
+    sibs, bury = SiblingIndex(), BuryList(clock=clock)
+    new_today = DailyCount(clock)            # new-card limit across planner rebuilds
 
     # ----- inner helpers --------------------------------
+    def card(word):
+        return card_key(word, current_mode.get())
+
+    def card_id(word):
+        return f"{'de2it' if reverse else 'it2de'}/{card(word)}"
+
+    def due_of(word):
+        return max(srs.due(card(word)), bury.until(sibs.group(word), card_id(word)))
+
+    def make_sampler():
+        # new cards only come from the planner, which keeps the daily limit
+        return DueSampler(nouns.keys(), due_of, clock=clock, rng=rng, new_weight=0)
+
+    def make_planner():
+        return SessionPlanner(nouns.keys(), lambda w: srs.record(card(w)), origin, clock=clock,
+                              skip=lambda w: srs.suspended(card(w))
+                              or bury.buried(sibs.group(w), card_id(w)), new_today=new_today)
+
+    def change_mode(*_):
+        nonlocal sampler, planner
+        if not nouns:
+            return
+        sampler = make_sampler()             # other cards, other due times
+        planner = make_planner()
+        new_word()
+
     def toggle_dir():
-        nonlocal reverse, srs
+        nonlocal reverse, srs, sampler, planner
         reverse = not reverse
-        srs = make_srs()                     # load the other SRS file
+        srs = make_srs()                     # load the other direction's shards
+        sampler = make_sampler()
+        planner = make_planner()
         dir_btn.config(text=f"Richtung: {'IT→DE' if not reverse else 'DE→IT'}")
-        next_word()
+        new_word()
 
     def refresh_sel():
-        nonlocal selected, nouns, history, idx
-        selected = [f for f, v in chk_vars.items() if v.get()]
-        if not selected:
-            fb_lbl.config(text="⚠️ none selected", fg="orange")
-            return
-        nouns = load_lecture(selected)
-        history, idx = [], -1
-        next_word()
-
-    def next_word(_=None):
-        nonlocal current, idx
-        if not nouns:
+        nonlocal selected, nouns, rev_idx, sibs, sampler, planner
+        ticked = [f for f, v in chk_vars.items() if v.get()]
+        for name in selected:
+            if name not in ticked:
+                srs.deactivate(name)
+        for name in ticked:
+            srs.activate(name, load_lecture([name]).keys())
+        selected = ticked
+        if not selected:                     # its shards are gone: drop the deck too
+            nouns, sampler, planner = {}, None, None
+            origin.clear()
+            history.clear()
+            clear_card("⚠️ none selected", "orange")
             return
+        origin.clear()
+        nouns = load_lecture(selected, origin)
+        rev_idx = ReverseIndex(nouns)
+        sibs = SiblingIndex(nouns.keys())
+        sampler = make_sampler()
+        planner = make_planner()
+        history.clear()
+        new_word()
+
+    def show(word):
+        nonlocal current
+        current = word
+        entry.config(state="normal")
         entry.delete(0, tk.END)
         fb_lbl.config(text="")
-
-        pool = srs.get_due_words(list(nouns.keys())) or list(nouns.keys())
-        current = random.choice(pool)
-        history.append(current)
-        idx = len(history) - 1
+        ex_lbl.config(text="")
 
         mode = current_mode.get()
-        if mode == "Translate":
-            prompt = current if not reverse else nouns[current]["de"]
-            if isinstance(prompt, list):
-                prompt = prompt[0]
+        if mode in ("Translate", "Multiple choice"):
+            prompt = current if not reverse else de_list(nouns[current])[0]
         else:          # Plural or Indef. article → always show singular IT
             prompt = current
 
         q_lbl.config(text=prompt)
+        allow_listen(prompt == current)      # DE→IT: the audio would be the answer
+        if mode == "Multiple choice":
+            show_choices()
+        else:
+            choice_frm.pack_forget()
+
+    def clear_card(message, colour):
+        """No card on screen: nothing to check until the next one is shown."""
+        nonlocal current
+        current = None
+        entry.delete(0, tk.END)
+        entry.config(state="disabled")
+        q_lbl.config(text="")
+        ex_lbl.config(text="")
+        choice_frm.pack_forget()
+        allow_listen(False)
+        fb_lbl.config(text=message, fg=colour)
+
+    def allow_listen(ok=True):
+        listen_btn.config(state="normal" if ok and speaker.available else "disabled")
+
+    def show_choices():
+        nonlocal distractor_table, mc_right
+        if distractor_table is None:         # cached in distractors.json
+            distractor_table = load_table(all_nouns, all_origin)
+        direction = "de2it" if reverse else "it2de"
+        mc_right, opts = choices(distractor_table, direction, current, all_nouns,
+                                 sampler.keys, rng, len(choice_btns))
+        for i, btn in enumerate(choice_btns):
+            if i < len(opts):
+                btn.config(text=opts[i], command=lambda o=opts[i]: pick(o))
+                btn.grid()
+            else:                            # tiny deck: fewer options than buttons
+                btn.config(text="", command="")
+                btn.grid_remove()
+        choice_frm.pack(after=entry, pady=4)
+
+    def pick(option):
+        entry.delete(0, tk.END)
+        entry.insert(0, option)
+        check()
+
+    @timed("nouns.next_word")
+    def next_word(_=None):
+        if not nouns:
+            return
+        fwd = history.forward()              # after going back, step forward first
+        if fwd is not None:
+            show(sampler.keys[fwd])
+        else:
+            new_word()
+
+    def new_word():
+        if not nouns:
+            return
+        word = sampler.most_overdue(exclude=current) if overdue_first.get() else None
+        if word is None:                     # learning → review → new queues
+            word = planner.pop(exclude=current)
+            count("planner.hit" if word else "planner.miss")
+            word = word or sampler.sample()  # seen cards due but skipped earlier
+        if word is None:
+            clear_card("🎉 Nothing due right now", "green")
+            return
+        history.push(sampler.index[word])
+        show(word)
+        speaker.prefetch([word, *planner.peek(3)])
 
     def prev_word(_=None):
-        nonlocal current, idx
-        if idx > 0:
-            idx -= 1
-            current = history[idx]
-            q_lbl.config(text=current)
-            entry.delete(0, tk.END)
-            fb_lbl.config(text="")
+        back = history.back()
+        if back is not None:
+            show(sampler.keys[back])
 
+    @timed("nouns.check")
     def check(_=None):
+        if current is None:
+            return
         answer = norm(entry.get())
         mode = current_mode.get()
+        result = None                        # fuzzy grade, Translate mode only
+        confused = []                        # other cards the answer is right for
 
         if mode == "Translate":
+            # looked up before fuzzy grading: the exact answer to another noun
+            # is a confusion, never a typo (Tisch for Fisch, la nonna for il nonno)
+            mine = {current, *(rev_idx.italian_for(de_list(nouns[current])[0]) if reverse else ())}
+            confused = answers.other_cards(answer, reverse, mine)
             if not reverse:
                 corr = nouns[current]["de"]
                 corr_list = corr if isinstance(corr, list) else [corr]
-                ok = strip_article(answer) in [strip_article(norm(c)) for c in corr_list]
+                result, _ = grade(strip_article(answer), [strip_article(c) for c in corr_list],
+                                  taken=lambda _: bool(confused))
                 correct_disp = ", ".join(corr_list) if isinstance(corr, list) else corr
-            else:
-                ok = answer == norm(current)
-                correct_disp = current
+            else:                            # any Italian noun with this meaning
+                accepted = rev_idx.italian_for(de_list(nouns[current])[0]) or [current]
+                result, _ = grade(answer, accepted, taken=lambda _: bool(confused))
+                correct_disp = ", ".join(accepted)
+            ok = result != WRONG
+            if ok:
+                confused = []                # a translation shared with another noun
+
+        elif mode == "Multiple choice":
+            correct_disp = mc_right
+            ok = answer == norm(mc_right)
 
         elif mode == "Plural form":
             correct_disp = italian_plural(current)
@@ -217,18 +533,50 @@ def start_noun_trainer(prev):
             )
 
 
-        fb_lbl.config(
-            text="✅ Correct!" if ok else f"❌ Wrong. {correct_disp}",
-            fg="green" if ok else "red"
-        )
-        stats["correct" if ok else "wrong"] += 1
-        srs.update(current, ok)
+        direction = "de2it" if reverse else "it2de"
+        for other in confused:
+            confusions.add(direction, current, other)
+
+        almost = result == ALMOST
+        if almost:
+            fb_lbl.config(text=f"🟡 Almost: {correct_disp}", fg="orange")
+        elif confused:
+            meant = confused[0] if not reverse else de_list(all_nouns[confused[0]])[0]
+            fb_lbl.config(text=f"❌ Wrong. {correct_disp}\n(„{entry.get().strip()}“ = {meant})", fg="red")
+        else:
+            fb_lbl.config(
+                text="✅ Correct!" if ok else f"❌ Wrong. {correct_disp}",
+                fg="green" if ok else "red"
+            )
+        if examples:
+            for sent, src in examples.examples(current, limit=1):
+                ex_lbl.config(text=f"„{sent}“ — {src}")
+        stats["almost" if almost else "correct" if ok else "wrong"] += 1
+        allow_listen()
+        was_new = srs.record(card(current)) is None
+        srs.update(card(current), ok, almost)
+        bury.reviewed(sibs.group(current), card_id(current))
+        for word in (current, *sibs.siblings(current)):     # siblings are buried now
+            sampler.set_due(word, due_of(word))
+        planner.answered(current, was_new)
+        # confusable cards come up next to each other
+        for other in confused or confusions.partners(direction, current):
+            if other in nouns and (other in confused or sampler.is_due(other)):
+                planner.soon(other)
+
+    def leeches_changed():
+        nonlocal sampler, planner
+        if nouns:
+            sampler = make_sampler()         # released leeches are due again
+            planner = make_planner()
 
     def show_stats():
-        tot = stats["correct"] + stats["wrong"]
+        tot = sum(stats.values())
+        week = " ".join(str(n) for n in srs.load.forecast(clock()))
         messagebox.showinfo(
             "Stats",
-            f"Answered: {tot}\n✅ {stats['correct']}\n❌ {stats['wrong']}"
+            f"Answered: {tot}\n✅ {stats['correct']}\n🟡 {stats['almost']}\n❌ {stats['wrong']}"
+            f"\n\nReviews due, next 7 days: {week}"
         )
 
     # ----- UI layout ------------------------------------
@@ -247,10 +595,13 @@ def start_noun_trainer(prev):
         tk.Checkbutton(frm, text=f, variable=var, command=refresh_sel).pack(anchor="w")
 
     # Exercise modes
-    modes = ("Translate", "Plural form", "Indef. article")
+    modes = ("Translate", "Multiple choice", "Plural form", "Indef. article")
     current_mode = tk.StringVar(value=modes[0])
     tk.Label(root, text="Exercise mode:").pack(pady=(4, 0))
     tk.OptionMenu(root, current_mode, *modes).pack()
+    current_mode.trace_add("write", change_mode)
+    overdue_first = tk.BooleanVar(value=False)
+    tk.Checkbutton(root, text="Most overdue first", variable=overdue_first).pack()
 
     q_lbl = tk.Label(root, text="", font=("Helvetica", 20))
     q_lbl.pack(pady=14)
@@ -261,11 +612,29 @@ def start_noun_trainer(prev):
     entry.bind("<Up>", next_word)     # next
     entry.bind("<Down>", prev_word)   # previous
 
+    choice_frm = tk.Frame(root)           # packed in Multiple choice mode only
+    choice_btns = [tk.Button(choice_frm, width=28) for _ in range(4)]
+    for i, btn in enumerate(choice_btns):
+        btn.grid(row=i // 2, column=i % 2, padx=3, pady=3)
+
     fb_lbl = tk.Label(root, text="", font=("Helvetica", 14))
     fb_lbl.pack(pady=6)
+    ex_lbl = tk.Label(root, text="", font=("Helvetica", 11, "italic"), wraplength=420, fg="gray25")
+    ex_lbl.pack(pady=2)
 
+    listen_btn = tk.Button(root, text="🔊 Listen", command=lambda: speaker.play(current),
+                           state="normal" if speaker.available else "disabled")
+    listen_btn.pack(pady=3)
     tk.Button(root, text="Next", command=next_word).pack(pady=3)
     tk.Button(root, text="Stats", command=show_stats).pack(pady=3)
-    tk.Button(root, text="Back", command=lambda: (root.destroy(), __import__('app').main_menu())).pack(pady=10)
+    tk.Button(root, text="Leeches", command=lambda: leech_window(root, srs, leeches_changed)).pack(pady=3)
+    overlay(root)
+
+    def back():
+        speaker.close()
+        root.destroy()
+        __import__('app').main_menu()
+
+    tk.Button(root, text="Back", command=back).pack(pady=10)
 
     root.mainloop()